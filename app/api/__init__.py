@@ -1,10 +1,12 @@
 from fastapi import APIRouter
 from .linksAPI import router as linksRouter
+from .linksJsonAPI import router as linksJsonRouter
 from .userAPI import router as usersRouter
 
 router = APIRouter()
 
 router.include_router(linksRouter)
+router.include_router(linksJsonRouter)
 router.include_router(usersRouter)
 
 __all__ = [
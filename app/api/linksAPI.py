@@ -1,41 +1,189 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, Response, Form
-from fastapi.templating import Jinja2Templates
+import csv
+import json
+from datetime import datetime, timedelta, timezone
+from tempfile import SpooledTemporaryFile
+from typing import AsyncIterator, BinaryIO
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Form, Query
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from app.repositories.clickRepository import ClickRepository
 from app.repositories.linkRepository import LinkRepository
 from app.repositories.userRepository import UserRepository
-from app.schemes.linkSchemes import SLink
+from app.core.config import settings
+from app.core.database import release_request_session
+from app.core.routing import remember_write
+from app.core.templates import cache_headers, make_etag, not_modified, templates
+from app.schemes.clickSchemes import Granularity, SLinkStats
+from app.schemes.linkSchemes import SLink, LinkSort
 from app.schemes.userSchemes import SUser
 
 router = APIRouter(prefix="/dashboard", tags=["Work with Links in Dashboard"])
-templates = Jinja2Templates(directory="app/templates")
+
+def body_too_large() -> HTTPException:
+    return HTTPException(status_code=413, detail=f'Request body exceeds {settings.BULK_CREATE_MAX_BODY_SIZE} bytes')
+
+async def spool_body(request: Request) -> SpooledTemporaryFile:
+    try:
+        declared = int(request.headers.get('content-length', 0))
+    except ValueError:
+        raise HTTPException(status_code=400, detail='Invalid Content-Length')
+    if declared > settings.BULK_CREATE_MAX_BODY_SIZE:
+        raise body_too_large()
+
+    spool = SpooledTemporaryFile(max_size=settings.BULK_CREATE_SPOOL_SIZE)
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > settings.BULK_CREATE_MAX_BODY_SIZE:
+                raise body_too_large()
+            await run_in_threadpool(spool.write, chunk)
+        await run_in_threadpool(spool.seek, 0)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+async def iter_chunks(file: BinaryIO, size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    while chunk := await run_in_threadpool(file.read, size):
+        yield chunk
+
+async def iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    buffer = b''
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b'\n')
+        for line in lines:
+            yield line.decode('utf-8', errors='replace').rstrip('\r')
+    if buffer:
+        yield buffer.decode('utf-8', errors='replace').rstrip('\r')
+
+async def parse_bulk_rows(lines: AsyncIterator[str], ndjson: bool) -> AsyncIterator[tuple[int, str | None, str | None]]:
+    url_column = 0
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+
+        if ndjson:
+            try:
+                url = json.loads(line)['original_url']
+            except (ValueError, KeyError, TypeError):
+                yield line_number, None, 'Expected a JSON object with an original_url field'
+                continue
+            if not isinstance(url, str):
+                yield line_number, None, 'original_url must be a string'
+                continue
+        else:
+            row = next(csv.reader([line]))
+            if line_number == 1 and 'original_url' in row:
+                url_column = row.index('original_url')
+                continue
+            url = row[url_column] if len(row) > url_column else ''
+
+        url = url.strip()
+        if not url:
+            yield line_number, None, 'Empty URL'
+        else:
+            yield line_number, url, None
+
+def parse_link_limits(expires_at: str | None, max_clicks: str | None,
+                      utc_offset: str | None = None) -> tuple[datetime | None, int | None]:
+    try:
+        expires = datetime.fromisoformat(expires_at) if expires_at else None
+        limit = int(max_clicks) if max_clicks else None
+        if expires is not None and expires.tzinfo is None and utc_offset:
+            expires = expires.replace(tzinfo=timezone(timedelta(minutes=int(utc_offset))))
+    except ValueError:
+        raise HTTPException(status_code=400, detail='Invalid expiration time or click limit')
+    if limit is not None and limit < 1:
+        raise HTTPException(status_code=400, detail='Click limit must be positive')
+    return expires, limit
+
+async def to_ndjson(results: AsyncIterator[dict]) -> AsyncIterator[str]:
+    created = 0
+    failed = 0
+    async for result in results:
+        if 'error' in result:
+            failed += 1
+        else:
+            created += 1
+        yield json.dumps(result) + '\n'
+    yield json.dumps({'created': created, 'failed': failed}) + '\n'
 
 @router.get("", summary="Get links for current user")
-async def get_links(request: Request, current_user: SUser = Depends(UserRepository.require_auth)):
+async def get_links(request: Request,
+                    cursor: str | None = None,
+                    sort: LinkSort = 'newest',
+                    limit: int = Query(settings.DASHBOARD_PAGE_SIZE, ge=1),
+                    current_user: SUser = Depends(UserRepository.require_auth)):
     if not current_user:
         raise HTTPException(status_code=401, detail='Not Authorized')
 
-    links = await LinkRepository.get_links_by_user_id(current_user.id)
-    total_links = len(links)
-    total_clicks = sum(link.clicks_count for link in links)
+    limit = min(limit, settings.DASHBOARD_PAGE_SIZE_MAX)
+    totals = await LinkRepository.get_link_totals(current_user.id)
     domain = str(request.base_url.hostname)
 
+    etag = make_etag('dashboard', current_user.id, current_user.email, domain, sort, limit, cursor,
+                     tuple(totals.model_dump().values()))
+    headers = cache_headers(etag)
+    if not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    page = await LinkRepository.get_links_by_user_id(current_user.id, limit=limit, cursor=cursor, sort=sort)
+
     return templates.TemplateResponse("dashboard.html", {
         'request': request,
         'user': current_user,
-        'links': links,
-        'total_links': total_links,
-        'total_clicks': total_clicks,
+        'links': page.links,
+        'sort': page.sort,
+        'limit': limit,
+        'cursor': cursor,
+        'next_cursor': page.next_cursor,
+        'total_links': totals.total_links,
+        'total_clicks': totals.total_clicks,
         'domain': domain,
-    })
+    }, headers=headers)
 
 @router.get('/{link_id}', summary="Get link by id for current user")
 async def get_link_by_id(link_id: int,
                          current_user: SUser = Depends(UserRepository.require_auth)) -> SLink:
     return await LinkRepository.get_link_by_id(link_id, user_id=current_user.id)
 
+@router.get('/{link_id}/stats', summary="Get click statistics of a link for current user")
+async def get_link_stats(link_id: int,
+                         granularity: Granularity = 'hour',
+                         since: datetime | None = None,
+                         until: datetime | None = None,
+                         current_user: SUser = Depends(UserRepository.require_auth)) -> SLinkStats:
+    await LinkRepository.get_link_by_id(link_id, user_id=current_user.id)
+    return await ClickRepository.get_link_stats(link_id, granularity, since=since, until=until)
+
 @router.post("/create-link", summary="Create link")
 async def create_link(original_url: str = Form(...),
+                      expires_at: str | None = Form(None),
+                      max_clicks: str | None = Form(None),
+                      utc_offset: str | None = Form(None),
                       current_user: SUser = Depends(UserRepository.require_auth)):
-    return await LinkRepository.create_link(original_url, user_id=current_user.id)
+    expires, limit = parse_link_limits(expires_at, max_clicks, utc_offset)
+    return await LinkRepository.create_link(original_url, user_id=current_user.id,
+                                            expires_at=expires, max_clicks=limit)
+
+@router.post("/bulk-create-links", summary="Bulk create links from a CSV or NDJSON body")
+async def bulk_create_links(request: Request,
+                            current_user: SUser = Depends(UserRepository.require_auth)):
+    ndjson = 'json' in request.headers.get('content-type', '')
+    body = await spool_body(request)
+    rows = parse_bulk_rows(iter_lines(iter_chunks(body)), ndjson=ndjson)
+    results = LinkRepository.bulk_create_links(rows, user_id=current_user.id)
+    await release_request_session()
+    response = StreamingResponse(to_ndjson(results), media_type='application/x-ndjson',
+                                 background=BackgroundTask(body.close))
+    remember_write(response)
+    return response
 
 @router.post("/delete-link", summary="Delete link")
 async def delete_link(link_id: int = Form(...),
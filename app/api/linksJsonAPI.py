@@ -0,0 +1,99 @@
+import csv
+import io
+from datetime import datetime
+from typing import AsyncIterator, Literal, Sequence
+
+import orjson
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import Row
+
+from app.core.config import settings
+from app.core.database import release_request_session
+from app.core.routing import remember_write
+from app.repositories.clickRepository import ClickRepository
+from app.repositories.linkRepository import LINK_COLUMNS, LinkRepository
+from app.repositories.userRepository import UserRepository
+from app.schemes.clickSchemes import Granularity
+from app.schemes.linkSchemes import LinkSort, SLinkCreate
+from app.schemes.userSchemes import SUser
+
+router = APIRouter(prefix='/api/links', tags=['Links JSON API'], default_response_class=ORJSONResponse)
+
+EXPORT_FIELDS = [column.key for column in LINK_COLUMNS]
+
+async def export_ndjson(batches: AsyncIterator[Sequence[Row]]) -> AsyncIterator[bytes]:
+    async for rows in batches:
+        yield b''.join(orjson.dumps(row._asdict(), option=orjson.OPT_APPEND_NEWLINE) for row in rows)
+
+async def export_csv(batches: AsyncIterator[Sequence[Row]]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    async for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+@router.get('', summary='List links of the current user')
+async def list_links(cursor: str | None = None,
+                     sort: LinkSort = 'newest',
+                     limit: int = Query(settings.DASHBOARD_PAGE_SIZE, ge=1),
+                     current_user: SUser = Depends(UserRepository.require_api_auth)) -> ORJSONResponse:
+    limit = min(limit, settings.DASHBOARD_PAGE_SIZE_MAX)
+    rows, next_cursor = await LinkRepository.get_link_rows_by_user_id(
+        current_user.id, limit=limit, cursor=cursor, sort=sort
+    )
+    return ORJSONResponse({
+        'links': [row._asdict() for row in rows],
+        'sort': sort,
+        'next_cursor': next_cursor,
+    })
+
+@router.post('', summary='Create link', status_code=201)
+async def create_link(link_data: SLinkCreate,
+                      current_user: SUser = Depends(UserRepository.require_api_auth)) -> ORJSONResponse:
+    link = await LinkRepository.insert_link(link_data.original_url, user_id=current_user.id,
+                                            expires_at=link_data.expires_at, max_clicks=link_data.max_clicks)
+    response = ORJSONResponse(link._asdict(), status_code=201)
+    remember_write(response)
+    return response
+
+@router.get('/export', summary='Export all links of the current user as NDJSON or CSV')
+async def export_links(format: Literal['ndjson', 'csv'] = 'ndjson',
+                       current_user: SUser = Depends(UserRepository.require_api_auth)) -> StreamingResponse:
+    batches = LinkRepository.stream_links(current_user.id)
+    await release_request_session()
+    if format == 'csv':
+        content, media_type = export_csv(batches), 'text/csv'
+    else:
+        content, media_type = export_ndjson(batches), 'application/x-ndjson'
+    return StreamingResponse(content, media_type=media_type, headers={
+        'Content-Disposition': f'attachment; filename="links.{format}"',
+    })
+
+@router.get('/{link_id}', summary='Get link')
+async def get_link(link_id: int,
+                   current_user: SUser = Depends(UserRepository.require_api_auth)) -> ORJSONResponse:
+    link = await LinkRepository.get_link_by_id(link_id, user_id=current_user.id)
+    return ORJSONResponse(link.model_dump())
+
+@router.delete('/{link_id}', summary='Delete link', status_code=204)
+async def delete_link(link_id: int,
+                      current_user: SUser = Depends(UserRepository.require_api_auth)) -> Response:
+    await LinkRepository.remove_link(link_id, user_id=current_user.id)
+    response = Response(status_code=204)
+    remember_write(response)
+    return response
+
+@router.get('/{link_id}/stats', summary='Get click statistics of a link')
+async def get_link_stats(link_id: int,
+                         granularity: Granularity = 'hour',
+                         since: datetime | None = None,
+                         until: datetime | None = None,
+                         current_user: SUser = Depends(UserRepository.require_api_auth)) -> ORJSONResponse:
+    await LinkRepository.get_link_by_id(link_id, user_id=current_user.id)
+    stats = await ClickRepository.get_link_stats(link_id, granularity, since=since, until=until)
+    return ORJSONResponse(stats.model_dump())
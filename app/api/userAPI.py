@@ -1,15 +1,15 @@
 from fastapi import APIRouter, Response, Form, Request
-from fastapi.templating import Jinja2Templates
 from starlette.responses import RedirectResponse
 from starlette.templating import _TemplateResponse
 
+from app.core.routing import remember_write
+from app.core.templates import templates
 from app.core.exceptions import PasswordValidationException, EmailValidationException
 from app.core.validators import PasswordValidator, EmailValidator
 from app.repositories.userRepository import UserRepository
 from app.schemes.userSchemes import SCreateUser, SLoginUser, SUser
 
 router = APIRouter(prefix='/users', tags=["Work with user"])
-templates = Jinja2Templates(directory="app/templates")
 
 def set_cookie(response: Response, to_encode_data: str):
     response.set_cookie(
@@ -54,6 +54,7 @@ async def register_user(request: Request,
 
         redirect_response = RedirectResponse(url="/dashboard", status_code=303)
         set_cookie(redirect_response, encodeJWT)
+        remember_write(redirect_response)
         return redirect_response
     except (PasswordValidationException, EmailValidationException, ValueError) as e:
         return templates.TemplateResponse("register.html", {
@@ -83,7 +84,10 @@ async def login_user(request: Request,
         })
 
 @router.get('/logout', summary="Logout user")
-async def logout_user(response: Response) -> RedirectResponse:
+async def logout_user(request: Request, response: Response) -> RedirectResponse:
+    if token := request.cookies.get('access_token'):
+        await UserRepository.revoke_token(token)
+
     redirect_response = RedirectResponse(url='/')
     redirect_response.delete_cookie('access_token')
     return redirect_response
\ No newline at end of file
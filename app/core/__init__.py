@@ -1,10 +1,19 @@
-from .database import Base, async_session_maker
+from .database import Base, async_session_maker, get_pool_stats, primary_reads, read_session
 from .config import settings, get_db_url, get_auth_data
+from .bloom import BloomFilter
+from .cache import TTLCache
+from .hyperloglog import HyperLogLog
 
 __all__ = [
     'Base',
     'async_session_maker',
+    'get_pool_stats',
+    'primary_reads',
+    'read_session',
     'settings',
     'get_db_url',
     'get_auth_data',
+    'BloomFilter',
+    'TTLCache',
+    'HyperLogLog',
 ]
\ No newline at end of file
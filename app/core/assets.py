@@ -0,0 +1,156 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import sys
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+APP_DIR = Path(__file__).resolve().parent.parent
+SOURCE_DIR = APP_DIR / 'static'
+BUILD_DIR = Path(settings.STATIC_BUILD_DIR) if settings.STATIC_BUILD_DIR else APP_DIR / 'static_build'
+MANIFEST_NAME = 'manifest.json'
+STATIC_PREFIX = '/static/'
+COMPRESSIBLE_SUFFIXES = {'.css', '.js', '.svg', '.json', '.txt', '.html', '.map'}
+FINGERPRINT_PATTERN = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+manifest: dict[str, str] = {}
+manifest_version = ''
+
+
+def _write(path: Path, data: bytes) -> None:
+    if path.exists() and path.stat().st_size == len(data) and path.read_bytes() == data:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    temporary.write_bytes(data)
+    os.replace(temporary, path)
+
+
+def _fingerprint(relative: Path, data: bytes) -> Path:
+    digest = hashlib.blake2b(data, digest_size=6).hexdigest()
+    return relative.with_name(f'{relative.stem}.{digest}{relative.suffix}')
+
+
+def _write_variants(path: Path, data: bytes) -> None:
+    if path.suffix not in COMPRESSIBLE_SUFFIXES or len(data) < settings.STATIC_COMPRESS_MIN_SIZE:
+        return
+
+    _write(path.with_name(path.name + '.gz'), gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _write(path.with_name(path.name + '.br'), brotli.compress(data, quality=11))
+
+
+def build_assets(source: Path = SOURCE_DIR, target: Path = BUILD_DIR) -> dict[str, str]:
+    entries = {}
+    for path in sorted(source.rglob('*')):
+        if not path.is_file() or path.name.startswith('.'):
+            continue
+
+        relative = path.relative_to(source)
+        data = path.read_bytes()
+        fingerprinted = _fingerprint(relative, data)
+        for name in (relative, fingerprinted):
+            _write(target / name, data)
+            _write_variants(target / name, data)
+        entries[relative.as_posix()] = fingerprinted.as_posix()
+
+    _write(target / MANIFEST_NAME, json.dumps(entries, indent=2, sort_keys=True).encode())
+    _set_manifest(entries)
+    return entries
+
+
+def load_manifest(target: Path = BUILD_DIR) -> dict[str, str]:
+    try:
+        entries = json.loads((target / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        entries = {}
+    _set_manifest(entries)
+    return entries
+
+
+def _set_manifest(entries: dict[str, str]) -> None:
+    global manifest, manifest_version
+    manifest = entries
+    manifest_version = hashlib.blake2b(json.dumps(entries, sort_keys=True).encode(), digest_size=8).hexdigest()
+
+
+def static_url(path: str) -> str:
+    path = path.lstrip('/')
+    return STATIC_PREFIX + manifest.get(path, path)
+
+
+def _accepted_encodings(header: str) -> dict[str, float]:
+    accepted = {}
+    for value in header.split(','):
+        coding, _, params = value.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, raw = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(raw.strip())
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def _negotiate_encoding(header: str) -> list[tuple[str, str]]:
+    accepted = _accepted_encodings(header)
+    wildcard = accepted.get('*', 0.0)
+    ranked = [
+        (accepted.get(encoding, wildcard), encoding, suffix)
+        for encoding, suffix in ENCODINGS
+    ]
+    ranked.sort(key=lambda item: item[0], reverse=True)
+    return [(encoding, suffix) for quality, encoding, suffix in ranked if quality > 0]
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+        media_type = mimetypes.guess_type(full_path)[0] or 'text/plain'
+        headers = {'Vary': 'Accept-Encoding'}
+        headers['Cache-Control'] = IMMUTABLE if FINGERPRINT_PATTERN.search(full_path) else 'no-cache'
+
+        for encoding, suffix in _negotiate_encoding(request_headers.get('accept-encoding', '')):
+            try:
+                variant_stat = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            full_path, stat_result = full_path + suffix, variant_stat
+            headers['Content-Encoding'] = encoding
+            break
+
+        response = FileResponse(
+            full_path, status_code=status_code, stat_result=stat_result, media_type=media_type, headers=headers,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+if __name__ == '__main__':
+    target = Path(sys.argv[1]) if len(sys.argv) > 1 else BUILD_DIR
+    written = build_assets(target=target)
+    print(f'Fingerprinted {len(written)} assets into {target}')
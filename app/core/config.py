@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -9,6 +11,90 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     DEBUG: bool
+    DATABASE_URL: str | None = None
+
+    HOST: str = '0.0.0.0'
+    PORT: int = 8000
+    WORKERS: int = 1
+
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    SLOW_QUERY_THRESHOLD: float | None = 0.5
+    METRICS_ENABLED: bool = True
+
+    DATABASE_REPLICA_URL: str | None = None
+    DB_REPLICA_POOL_SIZE: int = 10
+    DB_REPLICA_MAX_OVERFLOW: int = 20
+    READ_YOUR_WRITES_WINDOW: int = 10
+
+    LINK_CACHE_SIZE: int = 10_000
+    LINK_CACHE_TTL: float = 300
+    LINK_CAPPED_CACHE_TTL: float = 5
+    USER_CACHE_SIZE: int = 10_000
+    USER_CACHE_TTL: float = 60
+    CACHE_INVALIDATION_CHANNEL: str = 'cache_invalidation'
+    CACHE_INVALIDATION_RECONNECT_DELAY: float = 1.0
+
+    BLOOM_ENABLED: bool = True
+    BLOOM_ERROR_RATE: float = 0.001
+    BLOOM_MIN_CAPACITY: int = 100_000
+    BLOOM_HEADROOM: float = 1.5
+    BLOOM_REBUILD_INTERVAL: float = 3600
+
+    CLICK_FLUSH_INTERVAL: float = 1.0
+    CLICK_FLUSH_THRESHOLD: int = 1000
+
+    CLICK_QUEUE_SIZE: int = 10_000
+    CLICK_QUEUE_POLICY: Literal['drop', 'block'] = 'drop'
+    CLICK_BATCH_SIZE: int = 500
+    CLICK_LINGER: float = 0.5
+    UA_CACHE_SIZE: int = 10_000
+    GEOIP_DB_PATH: str | None = None
+
+    ROLLUP_INTERVAL: float = 10
+    ROLLUP_BATCH_SIZE: int = 50_000
+    ROLLUP_LAG: float = 5
+    ROLLUP_MINUTE_RETENTION_HOURS: int = 48
+    STATS_MAX_BUCKETS: int = 1000
+    HLL_PRECISION: int = 11
+
+    CLICK_PARTITION_INTERVAL: Literal['day', 'month'] = 'month'
+    CLICK_PARTITION_PREMAKE: int = 3
+    CLICK_PARTITION_CHECK_INTERVAL: float = 3600
+    CLICK_RETENTION_DAYS: int | None = None
+
+    LINK_SWEEP_INTERVAL: float = 60
+    LINK_SWEEP_BATCH_SIZE: int = 500
+    LINK_SWEEP_CLICK_BATCH_SIZE: int = 5000
+    LINK_SWEEP_MAX_BATCHES: int = 100
+
+    SHORT_CODE_ALLOCATOR: Literal['sequence', 'random'] = 'sequence'
+    SHORT_CODE_LENGTH: int = 7
+    SHORT_CODE_BLOCK_SIZE: int = 1000
+    SHORT_CODE_SECRET: str | None = None
+
+    LINK_DEDUPE_MODE: Literal['off', 'user', 'global'] = 'off'
+
+    BULK_CREATE_CHUNK_SIZE: int = 1000
+    BULK_CREATE_SPOOL_SIZE: int = 8 * 1024 * 1024
+    BULK_CREATE_MAX_BODY_SIZE: int = 64 * 1024 * 1024
+    EXPORT_BATCH_SIZE: int = 1000
+
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
+    TEMPLATE_BYTECODE_CACHE_DIR: str | None = None
+    STATIC_BUILD_DIR: str | None = None
+    STATIC_BUILD_ON_STARTUP: bool = True
+    STATIC_COMPRESS_MIN_SIZE: int = 256
+
+    DASHBOARD_PAGE_SIZE: int = 20
+    DASHBOARD_PAGE_SIZE_MAX: int = 100
 
     class Config:
         env_file = ".env"
@@ -16,6 +102,8 @@ class Settings(BaseSettings):
 settings = Settings()
 
 def get_db_url():
+    if settings.DATABASE_URL:
+        return settings.DATABASE_URL
     return (f"postgresql+asyncpg://{settings.DATABASE_USER}:{settings.DATABASE_PASSWORD}@"
             f"{settings.DATABASE_HOST}:{settings.DATABASE_PORT}/{settings.DATABASE_NAME}")
 
@@ -1,15 +1,125 @@
+import hashlib
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Annotated
+from typing import Annotated, AsyncIterator, Iterator
 
-from sqlalchemy import func
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncAttrs
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncAttrs, AsyncEngine, AsyncSession
 from sqlalchemy.orm import DeclarativeBase, declared_attr, mapped_column, Mapped
-from app.core.config import get_db_url
+from app.core.config import get_db_url, settings
+from app.core.instrumentation import instrument_engine
+from app.core.metrics import registry
+from app.core.pool import InstrumentedPool
 
 DATABASE_URL = get_db_url()
-engine = create_async_engine(DATABASE_URL)
+
+def build_engine(url: str, pool_size: int, max_overflow: int) -> AsyncEngine:
+    connect_args = {}
+    if url.startswith('postgresql+asyncpg'):
+        connect_args['prepared_statement_cache_size'] = settings.DB_STATEMENT_CACHE_SIZE
+
+    return create_async_engine(
+        url,
+        poolclass=InstrumentedPool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+engine = build_engine(DATABASE_URL, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)
+instrument_engine(engine, 'primary')
 async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
 
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = build_engine(
+        settings.DATABASE_REPLICA_URL, settings.DB_REPLICA_POOL_SIZE, settings.DB_REPLICA_MAX_OVERFLOW
+    )
+    instrument_engine(replica_engine, 'replica')
+    replica_session_maker = async_sessionmaker(replica_engine, expire_on_commit=False)
+else:
+    replica_engine = None
+    replica_session_maker = async_session_maker
+
+prefer_primary: ContextVar[bool] = ContextVar('prefer_primary', default=False)
+request_session: ContextVar[AsyncSession | None] = ContextVar('request_session', default=None)
+
+def read_session() -> AsyncSession:
+    if prefer_primary.get():
+        return async_session_maker()
+    return replica_session_maker()
+
+def reads_from_replica() -> bool:
+    return replica_engine is not None and not prefer_primary.get()
+
+@contextmanager
+def primary_reads() -> Iterator[None]:
+    token = prefer_primary.set(True)
+    try:
+        yield
+    finally:
+        prefer_primary.reset(token)
+
+async def unit_of_work() -> AsyncIterator[AsyncSession]:
+    async with async_session_maker() as session:
+        token = request_session.set(session)
+        try:
+            yield session
+        finally:
+            request_session.reset(token)
+
+async def release_request_session() -> None:
+    session = request_session.get()
+    if session is not None:
+        await session.close()
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession]:
+    session = request_session.get()
+    if session is not None:
+        yield session
+        return
+
+    async with async_session_maker() as session:
+        yield session
+
+@asynccontextmanager
+async def read_scope() -> AsyncIterator[AsyncSession]:
+    if reads_from_replica():
+        async with replica_session_maker() as session:
+            yield session
+        return
+
+    async with session_scope() as session:
+        yield session
+
+@asynccontextmanager
+async def advisory_lock(name: str) -> AsyncIterator[bool]:
+    if engine.dialect.name != 'postgresql':
+        yield True
+        return
+
+    key = int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), 'big', signed=True)
+    async with engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level='AUTOCOMMIT')
+        acquired = await connection.scalar(select(func.pg_try_advisory_lock(key)))
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await connection.execute(select(func.pg_advisory_unlock(key)))
+
+def get_pool_stats() -> dict:
+    stats = {'primary': engine.sync_engine.pool.stats()}
+    if replica_engine is not None:
+        stats['replica'] = replica_engine.sync_engine.pool.stats()
+    return stats
+
+registry.register('db_pool', get_pool_stats)
+
 int_pk: type[int] = Annotated[int, mapped_column(primary_key=True)]
 created_at = Annotated[datetime, mapped_column(server_default=func.now())]
 updated_at = Annotated[datetime, mapped_column(server_default=func.now(), onupdate=datetime.now)]
@@ -0,0 +1,53 @@
+import hashlib
+import math
+
+HASH_BITS = 64
+
+
+class HyperLogLog:
+    def __init__(self, precision: int = 11, registers: bytes | None = None):
+        if not 4 <= precision <= 16:
+            raise ValueError('HyperLogLog precision must be between 4 and 16')
+
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.size)
+        if len(self.registers) != self.size:
+            raise ValueError('Register count does not match precision')
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'HyperLogLog':
+        return cls(precision=data[0], registers=data[1:])
+
+    def to_bytes(self) -> bytes:
+        return bytes([self.precision]) + bytes(self.registers)
+
+    @staticmethod
+    def hash(value: str) -> int:
+        return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), 'big')
+
+    def add(self, value: str) -> None:
+        hashed = self.hash(value)
+        index = hashed >> (HASH_BITS - self.precision)
+        remaining_bits = HASH_BITS - self.precision
+        remaining = hashed & ((1 << remaining_bits) - 1)
+        rank = remaining_bits - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        if other.precision != self.precision:
+            raise ValueError('Cannot merge sketches with different precision')
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        if self.size >= 128:
+            alpha = 0.7213 / (1 + 1.079 / self.size)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[self.size]
+
+        estimate = alpha * self.size ** 2 / math.fsum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.size and zeros:
+            estimate = self.size * math.log(self.size / zeros)
+        return round(estimate)
@@ -0,0 +1,102 @@
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger('app.slow_queries')
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+@dataclass(slots=True)
+class QueryStats:
+    count: int = 0
+    duration: float = 0.0
+
+
+request_queries: ContextVar[QueryStats | None] = ContextVar('request_queries', default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def _record_query(engine_name: str, conn, statement: str, executemany: bool) -> None:
+    elapsed = time.perf_counter() - conn.info['query_started'].pop()
+    registry.histogram('db_query_seconds', engine=engine_name).observe(elapsed)
+
+    stats = request_queries.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+
+    threshold = settings.SLOW_QUERY_THRESHOLD
+    if threshold is not None and elapsed >= threshold:
+        registry.increment('db_slow_queries', engine=engine_name)
+        logger.warning('Slow query on %s (%.1f ms, executemany=%s): %s',
+                       engine_name, elapsed * 1000, executemany, ' '.join(statement.split())[:2000])
+
+
+def _handle_error(context) -> None:
+    started = context.connection.info.get('query_started') if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        _record_query(name, conn, statement, executemany)
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine.sync_engine, 'after_cursor_execute', after_cursor_execute)
+    event.listen(engine.sync_engine, 'handle_error', _handle_error)
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = request_queries.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                headers = list(message.get('headers', []))
+                headers.append((
+                    b'server-timing',
+                    f'db;desc="{stats.count} queries";dur={stats.duration * 1000:.2f}'.encode(),
+                ))
+                message = {**message, 'headers': headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_queries.reset(token)
+            elapsed = time.perf_counter() - started
+            route = scope.get('route')
+            labels = {
+                'method': scope['method'],
+                'route': getattr(route, 'path', None) or scope.get('root_path') or 'unmatched',
+            }
+            registry.histogram('http_request_seconds', **labels).observe(elapsed)
+            registry.histogram('http_request_db_seconds', **labels).observe(stats.duration)
+            registry.histogram('http_request_db_queries', buckets=QUERY_COUNT_BUCKETS, **labels).observe(stats.count)
+            registry.increment('http_requests', **labels, status=str(status_code))
+
@@ -0,0 +1,121 @@
+import bisect
+import os
+import re
+from collections import defaultdict
+from typing import Callable
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def stats(self) -> dict:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': {str(bound): count for bound, count in self.cumulative()},
+        }
+
+
+def _metric_name(*parts: str) -> str:
+    return re.sub(r'[^a-zA-Z0-9_]', '_', '_'.join(part for part in parts if part)).lower()
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...], **extra: str) -> str:
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+def _format_bound(bound: float) -> str:
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+
+class MetricsRegistry:
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self._providers: dict[str, Callable[[], dict]] = {}
+        self._histograms: dict[str, dict[tuple, Histogram]] = defaultdict(dict)
+        self._counters: dict[str, dict[tuple, float]] = defaultdict(lambda: defaultdict(float))
+
+    def register(self, name: str, provider: Callable[[], dict]) -> None:
+        self._providers[name] = provider
+
+    def histogram(self, name: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS, **labels: str) -> Histogram:
+        key = tuple(sorted(labels.items()))
+        histogram = self._histograms[name].get(key)
+        if histogram is None:
+            histogram = self._histograms[name][key] = Histogram(buckets)
+        return histogram
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        self._counters[name][tuple(sorted(labels.items()))] += value
+
+    def _render_histogram(self, lines: list[str], name: str, labels: tuple, histogram: dict) -> None:
+        for bound, count in histogram['buckets'].items():
+            lines.append(f'{name}_bucket{_format_labels(labels, le=_format_bound(float(bound)))} {count}')
+        lines.append(f'{name}_sum{_format_labels(labels)} {histogram["sum"]}')
+        lines.append(f'{name}_count{_format_labels(labels)} {histogram["count"]}')
+
+    def _render_stats(self, lines: list[str], name: str, stats: dict, worker: tuple) -> None:
+        for key, value in stats.items():
+            metric = _metric_name(name, str(key))
+            if isinstance(value, dict) and {'count', 'sum', 'buckets'} <= value.keys():
+                lines.append(f'# TYPE {metric} histogram')
+                self._render_histogram(lines, metric, worker, value)
+            elif isinstance(value, dict):
+                self._render_stats(lines, metric, value, worker)
+            elif isinstance(value, (bool, int, float)):
+                lines.append(f'# TYPE {metric} gauge')
+                lines.append(f'{metric}{_format_labels(worker)} {float(value)}')
+
+    def render(self) -> str:
+        worker = (('worker', str(os.getpid())),)
+        info = _metric_name(self.namespace, 'worker_info')
+        lines = [
+            f'# HELP {info} Metrics are kept per worker process and every series carries a worker label, '
+            f'sum or aggregate across it',
+            f'# TYPE {info} gauge',
+            f'{info}{_format_labels(worker)} 1.0',
+        ]
+        for name, series in sorted(self._counters.items()):
+            metric = _metric_name(self.namespace, name)
+            lines.append(f'# TYPE {metric} counter')
+            for labels, value in sorted(series.items()):
+                lines.append(f'{metric}_total{_format_labels(worker + labels)} {value}')
+
+        for name, series in sorted(self._histograms.items()):
+            metric = _metric_name(self.namespace, name)
+            lines.append(f'# TYPE {metric} histogram')
+            for labels, histogram in sorted(series.items()):
+                self._render_histogram(lines, metric, worker + labels, histogram.stats())
+
+        for name, provider in sorted(self._providers.items()):
+            self._render_stats(lines, _metric_name(self.namespace, name), provider(), worker)
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry('url_shortener')
@@ -0,0 +1,50 @@
+import time
+
+from starlette.requests import cookie_parser
+from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.database import prefer_primary, replica_engine
+
+READ_PRIMARY_COOKIE = 'read_primary_until'
+
+
+def remember_write(response: Response) -> None:
+    if replica_engine is None:
+        return
+
+    window = settings.READ_YOUR_WRITES_WINDOW
+    response.set_cookie(
+        key=READ_PRIMARY_COOKIE,
+        value=str(int(time.time()) + window),
+        max_age=window,
+        httponly=True,
+        samesite='lax',
+        path='/',
+    )
+
+
+class ReadRoutingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or replica_engine is None:
+            await self.app(scope, receive, send)
+            return
+
+        until = None
+        for name, value in scope['headers']:
+            if name == b'cookie':
+                until = cookie_parser(value.decode('latin-1')).get(READ_PRIMARY_COOKIE)
+                break
+
+        if until and until.isdigit() and int(until) > time.time():
+            token = prefer_primary.set(True)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                prefer_primary.reset(token)
+        else:
+            await self.app(scope, receive, send)
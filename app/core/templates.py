@@ -0,0 +1,95 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from pathlib import Path
+
+from fastapi import Request
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from app.core import assets
+from app.core.config import settings
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / 'templates'
+
+environment = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    autoescape=True,
+    bytecode_cache=FileSystemBytecodeCache(settings.TEMPLATE_BYTECODE_CACHE_DIR),
+    auto_reload=settings.DEBUG,
+    cache_size=-1,
+)
+environment.globals['static_url'] = assets.static_url
+templates = Jinja2Templates(env=environment)
+
+_template_version: tuple[str, datetime] | None = None
+
+
+def _scan_templates() -> tuple[str, datetime]:
+    digest = hashlib.blake2b(digest_size=8)
+    newest = 0.0
+    for name in sorted(environment.list_templates()):
+        path = TEMPLATES_DIR / name
+        digest.update(name.encode())
+        digest.update(path.read_bytes())
+        newest = max(newest, path.stat().st_mtime)
+    return digest.hexdigest(), datetime.fromtimestamp(int(newest), tz=timezone.utc)
+
+
+def precompile_templates() -> int:
+    global _template_version
+    names = environment.list_templates()
+    for name in names:
+        environment.get_template(name)
+    _template_version = _scan_templates()
+    return len(names)
+
+
+def template_version() -> tuple[str, datetime]:
+    if _template_version is None or settings.DEBUG:
+        return _scan_templates()
+    return _template_version
+
+
+def make_etag(*parts) -> str:
+    version, _ = template_version()
+    digest = hashlib.blake2b(repr((version, assets.manifest_version, *parts)).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def page_last_modified(*moments: datetime | None) -> datetime:
+    _, templates_changed = template_version()
+    moments = [
+        moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+        for moment in moments if moment is not None
+    ]
+    return max([templates_changed, *moments]).replace(microsecond=0)
+
+
+def cache_headers(etag: str, last_modified: datetime | None = None) -> dict[str, str]:
+    headers = {
+        'ETag': etag,
+        'Cache-Control': 'private, no-cache',
+        'Vary': 'Cookie',
+    }
+    if last_modified is not None:
+        headers['Last-Modified'] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def not_modified(request: Request, etag: str, last_modified: datetime | None = None) -> bool:
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in tags or etag in tags or etag.removeprefix('W/') in tags
+
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified <= since
+    return False
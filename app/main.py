@@ -1,30 +1,85 @@
-from urllib.parse import urlparse
+import asyncio
+from contextlib import asynccontextmanager
 
 import uvicorn
-from fastapi import FastAPI, Request, HTTPException, Depends
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
-from sqlalchemy import select
-from starlette.staticfiles import StaticFiles
+from fastapi import FastAPI, Request, HTTPException, Depends, Response
+from fastapi.responses import HTMLResponse, ORJSONResponse, PlainTextResponse, RedirectResponse
 
 from app.api import router
-from app.core import async_session_maker
-from app.models import Link
-from app.repositories import UserRepository
+from app.core.assets import BUILD_DIR, PrecompressedStaticFiles, build_assets, load_manifest
+from app.core.config import settings
+from app.core.database import unit_of_work
+from app.core.instrumentation import RequestMetricsMiddleware
+from app.core.metrics import registry
+from app.core.routing import ReadRoutingMiddleware
+from app.core.templates import (
+    cache_headers,
+    make_etag,
+    not_modified,
+    page_last_modified,
+    precompile_templates,
+    templates,
+)
+from app.repositories import LinkRepository, UserRepository
 from app.schemes import SUser
+from app.services import (
+    ClickEvent,
+    cache_invalidator,
+    click_counter,
+    click_enricher,
+    click_partition_manager,
+    click_pipeline,
+    click_rollup_job,
+    link_sweeper,
+    password_hasher,
+    short_code_filter,
+)
 
-app = FastAPI(title="URL Shortener")
-app.include_router(router)
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.STATIC_BUILD_ON_STARTUP:
+        await asyncio.to_thread(build_assets)
+    else:
+        load_manifest()
+    precompile_templates()
+    await click_enricher.open()
+    await click_partition_manager.open()
+    click_counter.start()
+    click_pipeline.start()
+    click_rollup_job.start()
+    click_partition_manager.start()
+    short_code_filter.start()
+    cache_invalidator.start()
+    link_sweeper.start()
+    yield
+    await link_sweeper.stop()
+    await cache_invalidator.stop()
+    await short_code_filter.stop()
+    await click_partition_manager.stop()
+    await click_rollup_job.stop()
+    await click_pipeline.stop()
+    await click_counter.stop()
+    click_enricher.close()
+    password_hasher.shutdown()
 
-templates = Jinja2Templates(directory="app/templates")
+app = FastAPI(title="URL Shortener", lifespan=lifespan, dependencies=[Depends(unit_of_work)])
+app.add_middleware(ReadRoutingMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
+app.include_router(router)
+app.mount("/static", PrecompressedStaticFiles(directory=BUILD_DIR, check_dir=False), name="static")
 
 @app.get("/", response_class=HTMLResponse, tags=["Main"])
 async def home(request: Request, current_user: SUser | None = Depends(UserRepository.get_current_user)):
+    etag = make_etag('index', current_user.id if current_user else None, current_user.email if current_user else None)
+    last_modified = page_last_modified()
+    headers = cache_headers(etag, last_modified)
+    if not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
     return templates.TemplateResponse("index.html", {
         "request": request,
         "user": current_user
-    })
+    }, headers=headers)
 
 @app.get("/register", response_class=HTMLResponse, tags=["Authorization"])
 async def register(request: Request):
@@ -43,35 +98,32 @@ async def login(request: Request):
         return templates.TemplateResponse("login.html", {"request": request})
 
 @app.get('/r/{short_code}', summary='Redirect by short link')
-async def redirect_short_link(short_code: str):
-    async with async_session_maker() as session:
-        query = select(Link).where(Link.short_code == short_code)
-        result = await session.execute(query)
-        link = result.scalar_one_or_none()
-
-        if not link:
-            raise HTTPException(status_code=404, detail='Link not found')
-
-        link.clicks_count += 1
-        await session.commit()
-
-        if not link.original_url.startswith(('http://', 'https://')):
-            link.original_url = f'https://{link.original_url}'
+async def redirect_short_link(request: Request, short_code: str):
+    target = await LinkRepository.resolve_short_code(short_code)
+    click_counter.increment(target.id)
+    await click_pipeline.submit(ClickEvent(
+        link_id=target.id,
+        ip_address=request.client.host if request.client else '',
+        user_agent=request.headers.get('user-agent', ''),
+    ))
+    return RedirectResponse(url=target.original_url, status_code=302)
 
-        try:
-            urlparse(link.original_url)
-            return RedirectResponse(url=link.original_url, status_code=302)
-        except Exception:
-            raise HTTPException(status_code=400, detail="Invalid URL format")
+@app.get('/metrics', include_in_schema=False)
+async def metrics():
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail='Not found')
+    return PlainTextResponse(registry.render(), media_type='text/plain; version=0.0.4')
 
 @app.exception_handler(HTTPException)
 async def auth_exception_handler(request: Request, exc: HTTPException):
     if exc.status_code == 302 and "Not authenticated" in str(exc.detail):
         return RedirectResponse(url="/login", status_code=302)
+    if request.url.path.startswith("/api/"):
+        return ORJSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers=exc.headers)
     return templates.TemplateResponse("error.html", {
         "request": request,
         "error": exc.detail
     }, status_code=exc.status_code)
 
 if __name__ == '__main__':
-    uvicorn.run(app, host='0.0.0.0', port=8000)
\ No newline at end of file
+    uvicorn.run('app.main:app', host=settings.HOST, port=settings.PORT, workers=settings.WORKERS)
\ No newline at end of file
@@ -16,6 +16,7 @@ from app.core.database import DATABASE_URL, Base
 from app.models.user import User
 from app.models.link import Link
 from app.models.click import Click
+from app.models.rollup import ClickRollup, VisitorRollup, RollupWatermark
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,28 @@
+"""Add short code sequence
+
+Revision ID: 3c9d41a7b2e5
+Revises: e8f1f26ab9b1
+Create Date: 2026-10-18 10:12:04.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d41a7b2e5'
+down_revision: Union[str, Sequence[str], None] = 'e8f1f26ab9b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence('short_code_seq')))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.schema.DropSequence(sa.Sequence('short_code_seq')))
@@ -0,0 +1,32 @@
+"""Index rollup retention
+
+Revision ID: 5e1d9c7b3a48
+Revises: c3f8a1d56e27
+Create Date: 2026-10-18 23:02:11.845130
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1d9c7b3a48'
+down_revision: Union[str, Sequence[str], None] = 'c3f8a1d56e27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_clickrollups_granularity_bucket_start', 'clickrollups', ['granularity', 'bucket_start'],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_clickrollups_granularity_bucket_start', table_name='clickrollups',
+                      postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,36 @@
+"""Normalize link urls
+
+Revision ID: 7a2f0c6d9e14
+Revises: 3c9d41a7b2e5
+Create Date: 2026-10-18 11:02:47.530912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2f0c6d9e14'
+down_revision: Union[str, Sequence[str], None] = '3c9d41a7b2e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.text(
+        "UPDATE links SET original_url = 'https://' || btrim(original_url) "
+        "WHERE lower(btrim(original_url)) NOT LIKE 'http://%' "
+        "AND lower(btrim(original_url)) NOT LIKE 'https://%'"
+    ))
+    op.execute(sa.text(
+        "UPDATE links SET original_url = btrim(original_url) "
+        "WHERE original_url <> btrim(original_url)"
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    pass
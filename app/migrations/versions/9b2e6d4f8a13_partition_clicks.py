@@ -0,0 +1,116 @@
+"""Partition clicks and add hot path indexes
+
+Revision ID: 9b2e6d4f8a13
+Revises: f4a1b7c3d2e8
+Create Date: 2026-10-18 21:04:52.118306
+
+"""
+from datetime import datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b2e6d4f8a13'
+down_revision: Union[str, Sequence[str], None] = 'f4a1b7c3d2e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PREMADE_PARTITIONS = 3
+
+
+def next_month(moment: datetime) -> datetime:
+    return (moment.replace(day=28) + timedelta(days=4)).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def click_columns(id_default: str) -> list[sa.Column]:
+    return [
+        sa.Column('id', sa.Integer(), server_default=sa.text(id_default), nullable=False),
+        sa.Column('ip_address', sa.String(), nullable=False),
+        sa.Column('country_code', sa.String(), nullable=False),
+        sa.Column('device_type', sa.String(), nullable=False),
+        sa.Column('link_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    latest = bind.scalar(sa.text('SELECT greatest(max(created_at), localtimestamp) FROM clicks'))
+    boundary = next_month(latest)
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_links_user_id_id', 'links', ['user_id', 'id'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('clicks_legacy_id_created_at_key', 'clicks', ['id', 'created_at'], unique=True,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_clicks_legacy_link_id_created_at', 'clicks', ['link_id', 'created_at'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.execute(sa.text(
+            f"ALTER TABLE clicks ADD CONSTRAINT clicks_legacy_bound "
+            f"CHECK (created_at < '{boundary.isoformat()}') NOT VALID"
+        ))
+        op.execute(sa.text('ALTER TABLE clicks VALIDATE CONSTRAINT clicks_legacy_bound'))
+
+    op.execute(sa.text('LOCK TABLE clicks IN ACCESS EXCLUSIVE MODE'))
+    op.rename_table('clicks', 'clicks_legacy')
+    op.execute(sa.text('ALTER TABLE clicks_legacy RENAME CONSTRAINT clicks_pkey TO clicks_legacy_pkey'))
+    op.execute(sa.text(
+        'ALTER TABLE clicks_legacy RENAME CONSTRAINT clicks_link_id_fkey TO clicks_legacy_link_id_fkey'
+    ))
+    op.execute(sa.text(
+        'ALTER TABLE clicks_legacy ADD CONSTRAINT clicks_legacy_id_created_at_key '
+        'UNIQUE USING INDEX clicks_legacy_id_created_at_key'
+    ))
+
+    op.create_table('clicks',
+    *click_columns("nextval('clicks_id_seq'::regclass)"),
+    sa.ForeignKeyConstraint(['link_id'], ['links.id'], name='clicks_link_id_fkey', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', 'created_at', name='clicks_pkey'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.create_index('ix_clicks_link_id_created_at', 'clicks', ['link_id', 'created_at'], unique=False)
+    op.execute(sa.text('ALTER SEQUENCE clicks_id_seq OWNED BY clicks.id'))
+
+    op.execute(sa.text(
+        f"ALTER TABLE clicks ATTACH PARTITION clicks_legacy "
+        f"FOR VALUES FROM (MINVALUE) TO ('{boundary.isoformat()}')"
+    ))
+    op.drop_constraint('clicks_legacy_bound', 'clicks_legacy', type_='check')
+
+    start = boundary
+    for _ in range(PREMADE_PARTITIONS):
+        end = next_month(start)
+        op.execute(sa.text(
+            f"CREATE TABLE clicks_p{start:%Y%m%d} PARTITION OF clicks "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+        start = end
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table('clicks_unpartitioned',
+    *click_columns("nextval('clicks_id_seq'::regclass)"),
+    sa.ForeignKeyConstraint(['link_id'], ['links.id'], name='clicks_unpartitioned_link_id_fkey', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name='clicks_unpartitioned_pkey')
+    )
+    op.execute(sa.text(
+        'INSERT INTO clicks_unpartitioned (id, ip_address, country_code, device_type, link_id, created_at, updated_at) '
+        'SELECT id, ip_address, country_code, device_type, link_id, created_at, updated_at FROM clicks'
+    ))
+    op.execute(sa.text('ALTER SEQUENCE clicks_id_seq OWNED BY clicks_unpartitioned.id'))
+    op.drop_table('clicks')
+
+    op.rename_table('clicks_unpartitioned', 'clicks')
+    op.execute(sa.text('ALTER TABLE clicks RENAME CONSTRAINT clicks_unpartitioned_pkey TO clicks_pkey'))
+    op.execute(sa.text(
+        'ALTER TABLE clicks RENAME CONSTRAINT clicks_unpartitioned_link_id_fkey TO clicks_link_id_fkey'
+    ))
+
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_links_user_id_id', table_name='links', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,38 @@
+"""Add revoked tokens
+
+Revision ID: a1e4c7f09b52
+Revises: 5e1d9c7b3a48
+Create Date: 2026-10-19 10:12:36.270418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1e4c7f09b52'
+down_revision: Union[str, Sequence[str], None] = '5e1d9c7b3a48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('revokedtokens',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('token_digest', sa.LargeBinary(length=32), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('token_digest')
+    )
+    op.create_index('ix_revokedtokens_expires_at', 'revokedtokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_revokedtokens_expires_at', table_name='revokedtokens')
+    op.drop_table('revokedtokens')
@@ -0,0 +1,58 @@
+"""Add click rollups
+
+Revision ID: b51e8d03c7a9
+Revises: 7a2f0c6d9e14
+Create Date: 2026-10-18 12:24:10.604217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b51e8d03c7a9'
+down_revision: Union[str, Sequence[str], None] = '7a2f0c6d9e14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('clickrollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('link_id', sa.Integer(), nullable=False),
+    sa.Column('granularity', sa.String(), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(), nullable=False),
+    sa.Column('country_code', sa.String(), nullable=False),
+    sa.Column('device_type', sa.String(), nullable=False),
+    sa.Column('clicks', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['link_id'], ['links.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('link_id', 'granularity', 'bucket_start', 'country_code', 'device_type')
+    )
+    op.create_table('rollupwatermarks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('last_click_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.execute(sa.text("INSERT INTO rollupwatermarks (name, last_click_id) VALUES ('clicks', 0)"))
+
+    op.drop_constraint('clicks_link_id_fkey', 'clicks', type_='foreignkey')
+    op.create_foreign_key('clicks_link_id_fkey', 'clicks', 'links', ['link_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('clicks_link_id_fkey', 'clicks', type_='foreignkey')
+    op.create_foreign_key('clicks_link_id_fkey', 'clicks', 'links', ['link_id'], ['id'])
+
+    op.drop_table('rollupwatermarks')
+    op.drop_table('clickrollups')
@@ -0,0 +1,33 @@
+"""Add link url digest
+
+Revision ID: c3f8a1d56e27
+Revises: 9b2e6d4f8a13
+Create Date: 2026-10-18 22:17:40.563291
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a1d56e27'
+down_revision: Union[str, Sequence[str], None] = '9b2e6d4f8a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('links', sa.Column('url_digest', sa.LargeBinary(length=16), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index('ix_links_url_digest', 'links', ['url_digest'], unique=True,
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_links_url_digest', table_name='links', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('links', 'url_digest')
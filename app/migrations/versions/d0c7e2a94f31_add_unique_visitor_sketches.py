@@ -0,0 +1,43 @@
+"""Add unique visitor sketches
+
+Revision ID: d0c7e2a94f31
+Revises: b51e8d03c7a9
+Create Date: 2026-10-18 13:40:52.217046
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd0c7e2a94f31'
+down_revision: Union[str, Sequence[str], None] = 'b51e8d03c7a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('links', sa.Column('unique_visitors', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.add_column('links', sa.Column('visitors_hll', sa.LargeBinary(), nullable=True))
+    op.create_table('visitorrollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('link_id', sa.Integer(), nullable=False),
+    sa.Column('granularity', sa.String(), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(), nullable=False),
+    sa.Column('sketch', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['link_id'], ['links.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('link_id', 'granularity', 'bucket_start')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('visitorrollups')
+    op.drop_column('links', 'visitors_hll')
+    op.drop_column('links', 'unique_visitors')
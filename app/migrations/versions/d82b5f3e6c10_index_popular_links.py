@@ -0,0 +1,33 @@
+"""Index popular links
+
+Revision ID: d82b5f3e6c10
+Revises: a1e4c7f09b52
+Create Date: 2026-10-19 11:05:48.913274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd82b5f3e6c10'
+down_revision: Union[str, Sequence[str], None] = 'a1e4c7f09b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_links_user_id_clicks_count_id', 'links',
+                        ['user_id', sa.text('clicks_count DESC'), sa.text('id DESC')], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_links_user_id_clicks_count_id', table_name='links',
+                      postgresql_concurrently=True, if_exists=True)
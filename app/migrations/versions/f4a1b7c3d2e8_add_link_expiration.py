@@ -0,0 +1,36 @@
+"""Add link expiration
+
+Revision ID: f4a1b7c3d2e8
+Revises: d0c7e2a94f31
+Create Date: 2026-10-18 18:31:07.402913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a1b7c3d2e8'
+down_revision: Union[str, Sequence[str], None] = 'd0c7e2a94f31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('links', sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('links', sa.Column('max_clicks', sa.Integer(), nullable=True))
+    op.create_index('ix_links_expires_at', 'links', ['expires_at'], unique=False,
+                    postgresql_where=sa.text('expires_at IS NOT NULL'))
+    op.create_index('ix_links_max_clicks', 'links', ['id'], unique=False,
+                    postgresql_where=sa.text('max_clicks IS NOT NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_links_max_clicks', table_name='links')
+    op.drop_index('ix_links_expires_at', table_name='links')
+    op.drop_column('links', 'max_clicks')
+    op.drop_column('links', 'expires_at')
@@ -1,9 +1,14 @@
-from .user import User
+from .user import User, RevokedToken
 from .link import Link
 from .click import Click
+from .rollup import ClickRollup, VisitorRollup, RollupWatermark
 
 __all__ = [
     'User',
+    'RevokedToken',
     'Link',
     'Click',
+    'ClickRollup',
+    'VisitorRollup',
+    'RollupWatermark',
 ]
\ No newline at end of file
@@ -1,12 +1,16 @@
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, relationship, mapped_column
 from app.core.database import Base, int_pk, str_nullable_false
 
 class Click(Base):
+    __table_args__ = (
+        Index('ix_clicks_link_id_created_at', 'link_id', 'created_at'),
+    )
+
     id: Mapped[int_pk]
     ip_address: Mapped[str_nullable_false]
     country_code: Mapped[str_nullable_false]
     device_type: Mapped[str_nullable_false]
-    link_id: Mapped[int] = mapped_column(ForeignKey('links.id'), nullable=False)
+    link_id: Mapped[int] = mapped_column(ForeignKey('links.id', ondelete='CASCADE'), nullable=False)
 
     link: Mapped['Link'] = relationship(back_populates='clicks')
\ No newline at end of file
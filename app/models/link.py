@@ -1,14 +1,30 @@
+from datetime import datetime
 from typing import List
-from sqlalchemy import ForeignKey
+from sqlalchemy import DateTime, ForeignKey, Index, LargeBinary, Sequence, text
 from sqlalchemy.orm import Mapped, relationship, mapped_column
 from app.core.database import Base, int_pk, str_uniq, str_nullable_false
 
+short_code_seq = Sequence('short_code_seq', metadata=Base.metadata)
+
 class Link(Base):
+    __table_args__ = (
+        Index('ix_links_user_id_id', 'user_id', 'id'),
+        Index('ix_links_user_id_clicks_count_id', 'user_id', text('clicks_count DESC'), text('id DESC')),
+        Index('ix_links_expires_at', 'expires_at', postgresql_where=text('expires_at IS NOT NULL')),
+        Index('ix_links_max_clicks', 'id', postgresql_where=text('max_clicks IS NOT NULL')),
+        Index('ix_links_url_digest', 'url_digest', unique=True),
+    )
+
     id: Mapped[int_pk]
     original_url: Mapped[str_nullable_false]
     short_code: Mapped[str_uniq]
     clicks_count: Mapped[int] = mapped_column(default=0)
+    unique_visitors: Mapped[int] = mapped_column(default=0)
+    visitors_hll: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True, deferred=True)
+    expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    max_clicks: Mapped[int | None] = mapped_column(nullable=True)
+    url_digest: Mapped[bytes | None] = mapped_column(LargeBinary(16), nullable=True)
     user_id: Mapped[int] = mapped_column(ForeignKey('users.id'), nullable=False)
 
-    clicks: Mapped[List['Click']] = relationship(back_populates='link', cascade='all, delete-orphan')
+    clicks: Mapped[List['Click']] = relationship(back_populates='link', cascade='all, delete-orphan', passive_deletes=True)
     user: Mapped['User'] = relationship(back_populates='links')
\ No newline at end of file
@@ -0,0 +1,34 @@
+from datetime import datetime
+from sqlalchemy import ForeignKey, Index, LargeBinary, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base, int_pk, str_uniq, str_nullable_false
+
+class ClickRollup(Base):
+    __table_args__ = (
+        UniqueConstraint('link_id', 'granularity', 'bucket_start', 'country_code', 'device_type'),
+        Index('ix_clickrollups_granularity_bucket_start', 'granularity', 'bucket_start'),
+    )
+
+    id: Mapped[int_pk]
+    link_id: Mapped[int] = mapped_column(ForeignKey('links.id', ondelete='CASCADE'), nullable=False)
+    granularity: Mapped[str_nullable_false]
+    bucket_start: Mapped[datetime] = mapped_column(nullable=False)
+    country_code: Mapped[str_nullable_false]
+    device_type: Mapped[str_nullable_false]
+    clicks: Mapped[int] = mapped_column(default=0)
+
+class VisitorRollup(Base):
+    __table_args__ = (
+        UniqueConstraint('link_id', 'granularity', 'bucket_start'),
+    )
+
+    id: Mapped[int_pk]
+    link_id: Mapped[int] = mapped_column(ForeignKey('links.id', ondelete='CASCADE'), nullable=False)
+    granularity: Mapped[str_nullable_false]
+    bucket_start: Mapped[datetime] = mapped_column(nullable=False)
+    sketch: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+class RollupWatermark(Base):
+    id: Mapped[int_pk]
+    name: Mapped[str_uniq]
+    last_click_id: Mapped[int] = mapped_column(default=0)
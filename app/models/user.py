@@ -1,5 +1,7 @@
+from datetime import datetime
 from typing import List
-from sqlalchemy.orm import Mapped, relationship
+from sqlalchemy import DateTime, LargeBinary
+from sqlalchemy.orm import Mapped, relationship, mapped_column
 from app.core.database import Base, int_pk, str_uniq, str_nullable_false
 
 class User(Base):
@@ -7,4 +9,9 @@ class User(Base):
     email: Mapped[str_uniq]
     password_hash: Mapped[str_nullable_false]
 
-    links: Mapped[List['Link']] = relationship(back_populates='user')
\ No newline at end of file
+    links: Mapped[List['Link']] = relationship(back_populates='user')
+
+class RevokedToken(Base):
+    id: Mapped[int_pk]
+    token_digest: Mapped[bytes] = mapped_column(LargeBinary(32), unique=True, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
\ No newline at end of file
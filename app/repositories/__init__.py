@@ -1,7 +1,9 @@
+from .clickRepository import ClickRepository
 from .linkRepository import LinkRepository
 from .userRepository import UserRepository
 
 __all__ = [
+    'ClickRepository',
     'LinkRepository',
     'UserRepository',
 ]
\ No newline at end of file
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.database import read_scope
+from app.core.hyperloglog import HyperLogLog
+from app.models.rollup import ClickRollup, VisitorRollup
+from app.schemes.clickSchemes import Granularity, SClickBucket, SLinkStats
+from app.services.clickRollup import truncate
+
+BUCKET_SIZES = {
+    'minute': timedelta(minutes=1),
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1),
+}
+DEFAULT_WINDOWS = {
+    'minute': timedelta(hours=1),
+    'hour': timedelta(days=2),
+    'day': timedelta(days=90),
+}
+
+
+class ClickRepository:
+    @staticmethod
+    def to_naive(moment: datetime | None) -> datetime | None:
+        if moment is None or moment.tzinfo is None:
+            return moment
+        return moment.astimezone().replace(tzinfo=None)
+
+    @classmethod
+    async def get_link_stats(cls, link_id: int, granularity: Granularity,
+                             since: datetime | None = None, until: datetime | None = None) -> SLinkStats:
+        until = cls.to_naive(until) or datetime.now()
+        since = cls.to_naive(since) or until - DEFAULT_WINDOWS[granularity]
+        since = max(since, until - BUCKET_SIZES[granularity] * settings.STATS_MAX_BUCKETS)
+
+        window = (
+            ClickRollup.link_id == link_id,
+            ClickRollup.granularity == granularity,
+            ClickRollup.bucket_start >= since,
+            ClickRollup.bucket_start <= until,
+        )
+        series_query = (
+            select(ClickRollup.bucket_start, func.sum(ClickRollup.clicks))
+            .where(*window)
+            .group_by(ClickRollup.bucket_start)
+            .order_by(ClickRollup.bucket_start)
+        )
+        countries_query = (
+            select(ClickRollup.country_code, func.sum(ClickRollup.clicks))
+            .where(*window)
+            .group_by(ClickRollup.country_code)
+        )
+        devices_query = (
+            select(ClickRollup.device_type, func.sum(ClickRollup.clicks))
+            .where(*window)
+            .group_by(ClickRollup.device_type)
+        )
+
+        sketch_granularity = 'hour' if granularity == 'minute' else granularity
+        sketch_query = select(VisitorRollup.sketch).where(
+            VisitorRollup.link_id == link_id,
+            VisitorRollup.granularity == sketch_granularity,
+            VisitorRollup.bucket_start >= truncate(since, sketch_granularity),
+            VisitorRollup.bucket_start <= until,
+        )
+
+        async with read_scope() as session:
+            series = (await session.execute(series_query)).all()
+            countries = (await session.execute(countries_query)).all()
+            devices = (await session.execute(devices_query)).all()
+            sketches = (await session.execute(sketch_query)).scalars().all()
+
+        visitors = None
+        for data in sketches:
+            sketch = HyperLogLog.from_bytes(data)
+            if visitors is None:
+                visitors = sketch
+            elif visitors.precision == sketch.precision:
+                visitors.merge(sketch)
+
+        return SLinkStats(
+            link_id=link_id,
+            granularity=granularity,
+            since=since,
+            until=until,
+            total_clicks=sum(clicks for _, clicks in series),
+            unique_visitors=visitors.count() if visitors else 0,
+            series=[SClickBucket(bucket_start=bucket_start, clicks=clicks) for bucket_start, clicks in series],
+            countries={country_code: clicks for country_code, clicks in countries},
+            devices={device_type: clicks for device_type, clicks in devices},
+        )
@@ -1,70 +1,422 @@
-import secrets
-import string
-from typing import List
+import base64
+import hashlib
+import ipaddress
+import json
+import re
+from datetime import datetime, timezone
+from typing import AsyncIterator, Sequence
+from urllib.parse import ParseResult, urlparse
 
 from fastapi import HTTPException, Depends, Form
-from sqlalchemy import select, delete
+from sqlalchemy import Row, select, delete, insert, func, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import RedirectResponse
 
-from app.core.database import async_session_maker
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.database import async_session_maker, read_scope, read_session, reads_from_replica, session_scope
+from app.core.routing import remember_write
 from app.models.link import Link
 from app.repositories.userRepository import UserRepository
 from app.schemes import SUser
-from app.schemes.linkSchemes import SLink
+from app.schemes.linkSchemes import SLink, SLinkTarget, SLinkPage, SLinkTotals, LinkSort
+from app.services.cacheInvalidator import RESET, cache_invalidator
+from app.services.shortCodeAllocator import short_code_allocator
+from app.services.shortCodeFilter import short_code_filter
 
+link_cache = TTLCache(maxsize=settings.LINK_CACHE_SIZE, ttl=settings.LINK_CACHE_TTL)
+LINK_COLUMNS = (
+    Link.id, Link.original_url, Link.short_code, Link.clicks_count, Link.unique_visitors,
+    Link.expires_at, Link.max_clicks, Link.created_at,
+)
+SHARED_LINK_COLUMNS = (Link.original_url, Link.short_code)
+HOST_LABEL = re.compile(r'(?!-)[a-z0-9_-]{1,63}(?<!-)')
+registry.register('link_cache', link_cache.stats)
+cache_invalidator.subscribe('link', link_cache.discard)
+cache_invalidator.subscribe('short_code', short_code_filter.add)
+cache_invalidator.subscribe(RESET, lambda _: link_cache.clear())
+cache_invalidator.subscribe(RESET, lambda _: short_code_filter.request_rebuild())
 
 class LinkRepository:
     @staticmethod
-    def generate_short_code(length: int = 6) -> str:
-        chars = string.ascii_letters + string.digits
-        return ''.join(secrets.choice(chars) for _ in range(length))
+    def validate_host(parsed: ParseResult) -> None:
+        hostname = parsed.hostname
+        if not hostname:
+            raise ValueError('Missing host')
+        if parsed.port == 0:
+            raise ValueError('Invalid port')
+
+        try:
+            ipaddress.ip_address(hostname)
+            return
+        except ValueError:
+            pass
+
+        labels = hostname.removesuffix('.').encode('idna').decode('ascii').split('.')
+        if not all(HOST_LABEL.fullmatch(label) for label in labels):
+            raise ValueError(f'Invalid host {hostname}')
+
+    @classmethod
+    def normalize_url(cls, url: str) -> str:
+        url = url.strip()
+        if not url.lower().startswith(('http://', 'https://')):
+            url = f'https://{url}'
+
+        try:
+            if any(char.isspace() for char in url):
+                raise ValueError('Whitespace in URL')
+            cls.validate_host(urlparse(url))
+        except ValueError:
+            raise HTTPException(status_code=422, detail="Invalid URL format")
+        return url
+
+    @staticmethod
+    def normalize_expiry(expires_at: datetime | None) -> datetime | None:
+        if expires_at is None:
+            return None
+        if expires_at.tzinfo is None:
+            raise HTTPException(status_code=400, detail="Expiration time must include a timezone offset")
+        if expires_at <= datetime.now(timezone.utc):
+            raise HTTPException(status_code=400, detail="Expiration time must be in the future")
+        return expires_at
+
+    @staticmethod
+    def consume_target(target: SLinkTarget) -> SLinkTarget:
+        expired = target.expires_at is not None and target.expires_at <= datetime.now(timezone.utc)
+        if expired or (target.clicks_remaining is not None and target.clicks_remaining <= 0):
+            raise HTTPException(status_code=410, detail='Link expired')
+
+        if target.clicks_remaining is not None:
+            target.clicks_remaining -= 1
+        return target
 
     @classmethod
-    async def create_link(cls, original_link: str, user_id: int) -> RedirectResponse:
-        short_code = cls.generate_short_code()
+    async def resolve_short_code(cls, short_code: str) -> SLinkTarget:
+        target = link_cache.get(short_code)
+        if target is not None:
+            return cls.consume_target(target)
 
-        new_link = Link(
-            original_url=original_link,
-            short_code=short_code,
-            user_id=user_id,
+        if not short_code_filter.might_exist(short_code):
+            raise HTTPException(status_code=404, detail='Link not found')
+
+        query = (
+            select(Link.id, Link.original_url, Link.expires_at, Link.max_clicks, Link.clicks_count)
+            .where(Link.short_code == short_code)
         )
+        async with read_scope() as session:
+            result = await session.execute(query)
+            row = result.one_or_none()
 
-        async with async_session_maker() as session:
-            session.add(new_link)
+        if row is None and reads_from_replica():
+            async with session_scope() as session:
+                result = await session.execute(query)
+                row = result.one_or_none()
+
+        if row is None:
+            raise HTTPException(status_code=404, detail='Link not found')
+
+        target = SLinkTarget(
+            id=row.id,
+            original_url=row.original_url,
+            expires_at=row.expires_at,
+            clicks_remaining=None if row.max_clicks is None else row.max_clicks - row.clicks_count,
+        )
+        ttl = settings.LINK_CAPPED_CACHE_TTL if row.max_clicks is not None else None
+        link_cache.set(short_code, target, ttl=ttl)
+        return cls.consume_target(target)
+
+    @staticmethod
+    def url_digest(url: str, user_id: int) -> bytes | None:
+        if settings.LINK_DEDUPE_MODE == 'off':
+            return None
+        scope = f'user:{user_id}' if settings.LINK_DEDUPE_MODE == 'user' else 'global'
+        return hashlib.blake2b(f'{scope}\n{url}'.encode(), digest_size=16).digest()
+
+    @staticmethod
+    def _insert_ignoring_duplicates(session: AsyncSession):
+        factory = pg_insert if session.get_bind().dialect.name == 'postgresql' else sqlite_insert
+        return factory(Link)
+
+    @staticmethod
+    async def _get_link_by_digest(session: AsyncSession, url_digest: bytes, user_id: int) -> Row | None:
+        owner_id = await session.scalar(select(Link.user_id).where(Link.url_digest == url_digest))
+        if owner_id is None:
+            return None
+
+        columns = LINK_COLUMNS if owner_id == user_id else SHARED_LINK_COLUMNS
+        result = await session.execute(select(*columns).where(Link.url_digest == url_digest))
+        return result.one_or_none()
+
+    @classmethod
+    async def insert_link(cls, original_link: str, user_id: int, expires_at: datetime | None = None,
+                          max_clicks: int | None = None) -> Row:
+        original_url = cls.normalize_url(original_link)
+        expires_at = cls.normalize_expiry(expires_at)
+        limited = expires_at is not None or max_clicks is not None
+        url_digest = None if limited else cls.url_digest(original_url, user_id)
+
+        async with session_scope() as session:
+            if url_digest is not None:
+                link = await cls._get_link_by_digest(session, url_digest, user_id)
+                if link is not None:
+                    return link
+
+            short_code = await short_code_allocator.next_code()
+            values = {
+                'original_url': original_url,
+                'short_code': short_code,
+                'user_id': user_id,
+                'clicks_count': 0,
+                'expires_at': expires_at,
+                'max_clicks': max_clicks,
+                'url_digest': url_digest,
+            }
+            if url_digest is None:
+                query = insert(Link).values(**values)
+            else:
+                query = (
+                    cls._insert_ignoring_duplicates(session)
+                    .values(**values)
+                    .on_conflict_do_nothing(index_elements=[Link.url_digest])
+                )
+            result = await session.execute(query.returning(*LINK_COLUMNS))
+            link = result.one_or_none()
+            if link is None:
+                return await cls._get_link_by_digest(session, url_digest, user_id)
+
+            await cache_invalidator.publish(session, 'short_code', short_code)
             await session.commit()
-            await session.refresh(new_link)
-            return RedirectResponse(url="/dashboard", status_code=303)
+
+        short_code_filter.add(short_code)
+        return link
+
+    @classmethod
+    async def create_link(cls, original_link: str, user_id: int, expires_at: datetime | None = None,
+                          max_clicks: int | None = None) -> RedirectResponse:
+        await cls.insert_link(original_link, user_id, expires_at=expires_at, max_clicks=max_clicks)
+        response = RedirectResponse(url="/dashboard", status_code=303)
+        remember_write(response)
+        return response
+
+    @classmethod
+    async def _store_links(cls, session: AsyncSession, rows: list[tuple[int, str]],
+                           user_id: int) -> tuple[list[str], list[str]]:
+        if settings.LINK_DEDUPE_MODE == 'off':
+            codes = await short_code_allocator.allocate(len(rows))
+            await session.execute(insert(Link), [
+                {'original_url': url, 'short_code': code, 'user_id': user_id, 'clicks_count': 0}
+                for (_, url), code in zip(rows, codes)
+            ])
+            return codes, codes
+
+        digests = [cls.url_digest(url, user_id) for _, url in rows]
+        urls = dict(zip(digests, (url for _, url in rows)))
+        result = await session.execute(
+            select(Link.url_digest, Link.short_code).where(Link.url_digest.in_(list(urls)))
+        )
+        known = dict(result.tuples().all())
+        missing = [digest for digest in urls if digest not in known]
+        if not missing:
+            return [known[digest] for digest in digests], []
+
+        codes = await short_code_allocator.allocate(len(missing))
+        query = (
+            cls._insert_ignoring_duplicates(session)
+            .on_conflict_do_nothing(index_elements=[Link.url_digest])
+            .returning(Link.url_digest, Link.short_code)
+        )
+        result = await session.execute(query, [
+            {'original_url': urls[digest], 'short_code': code, 'user_id': user_id, 'clicks_count': 0,
+             'url_digest': digest}
+            for digest, code in zip(missing, codes)
+        ])
+        created = dict(result.tuples().all())
+        known.update(created)
+
+        raced = [digest for digest in missing if digest not in created]
+        if raced:
+            result = await session.execute(
+                select(Link.url_digest, Link.short_code).where(Link.url_digest.in_(raced))
+            )
+            known.update(result.tuples().all())
+        return [known[digest] for digest in digests], list(created.values())
 
     @classmethod
-    async def get_links_by_user_id(cls, user_id: int) -> List[SLink]:
+    async def _insert_links(cls, session: AsyncSession, chunk: list[tuple[int, str | None, str | None]],
+                            user_id: int) -> list[dict]:
+        results = []
+        rows = []
+        for line, url, error in chunk:
+            if error is None:
+                try:
+                    url = cls.normalize_url(url)
+                except HTTPException as e:
+                    error = e.detail
+            if error is not None:
+                results.append({'line': line, 'error': error})
+            else:
+                rows.append((line, url))
+
+        if rows:
+            try:
+                codes, created = await cls._store_links(session, rows, user_id)
+                await cache_invalidator.publish(session, 'short_code', *created)
+                await session.commit()
+                for code in created:
+                    short_code_filter.add(code)
+                results.extend(
+                    {'line': line, 'original_url': url, 'short_code': code}
+                    for (line, url), code in zip(rows, codes)
+                )
+            except Exception:
+                await session.rollback()
+                results.extend({'line': line, 'error': 'Failed to create link'} for line, _ in rows)
+
+        results.sort(key=lambda result: result['line'])
+        return results
+
+    @classmethod
+    async def bulk_create_links(cls, rows: AsyncIterator[tuple[int, str | None, str | None]],
+                                user_id: int) -> AsyncIterator[dict]:
+        chunk = []
         async with async_session_maker() as session:
-            query = select(Link).where(Link.user_id == user_id)
-            result = await session.execute(query)
-            links_model = result.scalars().all()
-            links = [SLink.model_validate(link) for link in links_model]
+            async for row in rows:
+                chunk.append(row)
+                if len(chunk) >= settings.BULK_CREATE_CHUNK_SIZE:
+                    for result in await cls._insert_links(session, chunk, user_id):
+                        yield result
+                    chunk = []
+
+            if chunk:
+                for result in await cls._insert_links(session, chunk, user_id):
+                    yield result
+
+    @staticmethod
+    def _sort_columns(sort: LinkSort) -> tuple:
+        if sort == 'popular':
+            return Link.clicks_count, Link.id
+        return Link.id,
+
+    @staticmethod
+    def encode_cursor(sort: LinkSort, link: SLink | Row) -> str:
+        key = [link.clicks_count, link.id] if sort == 'popular' else [link.id]
+        payload = json.dumps([sort, *key]).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip('=')
 
-            return links
+    @staticmethod
+    def decode_cursor(sort: LinkSort, cursor: str) -> tuple:
+        try:
+            payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            cursor_sort, *key = json.loads(payload)
+            if cursor_sort != sort or len(key) != (2 if sort == 'popular' else 1):
+                raise ValueError
+            return tuple(int(value) for value in key)
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    @classmethod
+    async def get_link_rows_by_user_id(cls, user_id: int, limit: int, cursor: str | None = None,
+                                       sort: LinkSort = 'newest') -> tuple[Sequence[Row], str | None]:
+        columns = cls._sort_columns(sort)
+        query = select(*LINK_COLUMNS).where(Link.user_id == user_id)
+
+        if sort == 'oldest':
+            query = query.order_by(*(column.asc() for column in columns))
+        else:
+            query = query.order_by(*(column.desc() for column in columns))
+
+        if cursor:
+            key = cls.decode_cursor(sort, cursor)
+            if sort == 'oldest':
+                query = query.where(tuple_(*columns) > tuple_(*key))
+            else:
+                query = query.where(tuple_(*columns) < tuple_(*key))
+
+        async with read_scope() as session:
+            result = await session.execute(query.limit(limit + 1))
+            rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = cls.encode_cursor(sort, rows[-1])
+        return rows, next_cursor
+
+    @classmethod
+    async def get_links_by_user_id(cls, user_id: int, limit: int, cursor: str | None = None,
+                                   sort: LinkSort = 'newest') -> SLinkPage:
+        rows, next_cursor = await cls.get_link_rows_by_user_id(user_id, limit, cursor=cursor, sort=sort)
+        links = [SLink.model_validate(row) for row in rows]
+        return SLinkPage(links=links, sort=sort, next_cursor=next_cursor)
+
+    @classmethod
+    async def stream_links(cls, user_id: int) -> AsyncIterator[Sequence[Row]]:
+        query = (
+            select(*LINK_COLUMNS)
+            .where(Link.user_id == user_id)
+            .order_by(Link.id)
+            .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        async with read_session() as session:
+            result = await session.stream(query)
+            async for rows in result.partitions():
+                yield rows
+
+    @classmethod
+    async def get_link_totals(cls, user_id: int) -> SLinkTotals:
+        query = (
+            select(
+                func.count(Link.id).label('total_links'),
+                func.coalesce(func.sum(Link.clicks_count), 0).label('total_clicks'),
+                func.coalesce(func.sum(Link.unique_visitors), 0).label('total_unique_visitors'),
+                func.max(Link.id).label('last_link_id'),
+                func.max(Link.updated_at).label('last_modified'),
+            )
+            .where(Link.user_id == user_id)
+        )
+        async with read_scope() as session:
+            result = await session.execute(query)
+            return SLinkTotals.model_validate(result.one()._mapping)
 
     @classmethod
     async def get_link_by_id(cls, link_id: int, user_id: int) -> SLink:
-        async with async_session_maker() as session:
-            query = select(Link).where(Link.id == link_id, Link.user_id == user_id)
+        query = select(Link).where(Link.id == link_id, Link.user_id == user_id)
+        async with read_scope() as session:
             result = await session.execute(query)
             link = result.scalar_one_or_none()
-            if not link:
-                raise HTTPException(status_code=404, detail="Link not found")
-            return SLink.model_validate(link)
+
+        if not link and reads_from_replica():
+            async with session_scope() as session:
+                result = await session.execute(query)
+                link = result.scalar_one_or_none()
+
+        if not link:
+            raise HTTPException(status_code=404, detail="Link not found")
+        return SLink.model_validate(link)
 
     @classmethod
-    async def delete_link(cls, link_id: int, current_user: SUser):
-        async with async_session_maker() as session:
-            await cls.get_link_by_id(link_id, current_user.id)
+    async def remove_link(cls, link_id: int, user_id: int) -> None:
+        query = delete(Link).where(Link.id == link_id, Link.user_id == user_id).returning(Link.short_code)
+        async with session_scope() as session:
+            result = await session.execute(query)
+            short_code = result.scalar_one_or_none()
+            if short_code is None:
+                raise HTTPException(status_code=404, detail="Link not found")
 
-            query = delete(Link).where(Link.id == link_id)
-            await session.execute(query)
+            await cache_invalidator.publish(session, 'link', short_code)
             await session.commit()
 
-            return RedirectResponse(url="/dashboard", status_code=303)
+        link_cache.discard(short_code)
+
+    @classmethod
+    async def delete_link(cls, link_id: int, current_user: SUser):
+        await cls.remove_link(link_id, current_user.id)
+        response = RedirectResponse(url="/dashboard", status_code=303)
+        remember_write(response)
+        return response
 
     @classmethod
     async def link_exists(cls, link_id, user_id: int):
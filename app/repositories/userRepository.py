@@ -1,29 +1,35 @@
 from datetime import datetime, timedelta, timezone
+import hashlib
 import jwt
 from fastapi import HTTPException, Request
-from sqlalchemy import select
-from passlib.context import CryptContext
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from starlette import status
 
-from app.core.config import get_auth_data
-from app.core.database import async_session_maker
-from app.models.user import User
+from app.core.cache import TTLCache
+from app.core.config import get_auth_data, settings
+from app.core.metrics import registry
+from app.core.database import primary_reads, read_scope, release_request_session, session_scope
+from app.models.user import RevokedToken, User
 from app.schemes.userSchemes import SCreateUser, SLoginUser, SUser
+from app.services.cacheInvalidator import RESET, cache_invalidator
+from app.services.passwordHasher import password_hasher
 
-pwd_context =  CryptContext(schemes=['bcrypt'], deprecated='auto')
+user_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
 
 class UserRepository:
     @staticmethod
-    def get_password_hash(password: str) -> str:
-        return pwd_context.hash(password)
+    async def get_password_hash(password: str) -> str:
+        return await password_hasher.hash(password)
 
     @staticmethod
-    def verify_password(plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(plain_password: str, hashed_password: str) -> bool:
+        return await password_hasher.verify(plain_password, hashed_password)
 
     @classmethod
     async def user_exists(cls, user_data: SCreateUser | SLoginUser) -> User | None:
-        async with async_session_maker() as session:
+        async with read_scope() as session:
             query = select(User).where(User.email == user_data.email)
             result = await session.execute(query)
 
@@ -63,28 +69,83 @@ class UserRepository:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Token not found')
         return token
 
+    @staticmethod
+    def get_access_token(request: Request) -> str:
+        scheme, _, token = request.headers.get('authorization', '').partition(' ')
+        if scheme.lower() == 'bearer' and token.strip():
+            return token.strip()
+        return UserRepository.get_access_token_from_cookie(request)
+
+    @staticmethod
+    def token_digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
     @classmethod
     async def get_current_user_by_token(cls, token: str) -> SUser:
+        token_digest = cls.token_digest(token)
+        cached_user = user_cache.get(token_digest.hex())
+        if cached_user is not None:
+            return cached_user
+
         payload = cls.decode_access_token(token)
 
         expire = payload['exp']
         expire_time = datetime.fromtimestamp(int(expire), tz=timezone.utc)
-        if not expire or expire_time < datetime.now(timezone.utc):
+        now = datetime.now(timezone.utc)
+        if not expire or expire_time < now:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Token expired')
 
         user_id = payload['sub']
         if not user_id:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='User not found')
 
-        async with async_session_maker() as session:
-            query = select(User).where(User.id == int(user_id))
+        revoked = select(RevokedToken.id).where(RevokedToken.token_digest == token_digest).exists()
+        async with session_scope() as session:
+            query = select(User, revoked).where(User.id == int(user_id))
             result = await session.execute(query)
-            user_model = result.scalar_one_or_none()
+            row = result.one_or_none()
 
-            if not user_model:
+            if not row:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='User not found')
+            user_model, is_revoked = row
+            if is_revoked:
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Token revoked')
+
+            user = SUser.model_validate(user_model)
+            user_cache.set(token_digest.hex(), user, ttl=(expire_time - now).total_seconds())
+            return user
+
+    @staticmethod
+    def _discard_user(user_id: int | str) -> None:
+        user_cache.discard_where(lambda _, user: user.id == int(user_id))
+
+    @classmethod
+    async def revoke_token(cls, token: str) -> None:
+        token_digest = cls.token_digest(token)
+        user_cache.discard(token_digest.hex())
+        try:
+            payload = cls.decode_access_token(token)
+        except HTTPException:
+            return
+
+        async with session_scope() as session:
+            factory = pg_insert if session.get_bind().dialect.name == 'postgresql' else sqlite_insert
+            await session.execute(
+                factory(RevokedToken)
+                .values(token_digest=token_digest,
+                        expires_at=datetime.fromtimestamp(int(payload['exp']), tz=timezone.utc))
+                .on_conflict_do_nothing(index_elements=[RevokedToken.token_digest])
+            )
+            await session.execute(delete(RevokedToken).where(RevokedToken.expires_at < datetime.now(timezone.utc)))
+            await cache_invalidator.publish(session, 'token', token_digest.hex())
+            await session.commit()
 
-            return SUser.model_validate(user_model)
+    @classmethod
+    async def invalidate_user(cls, user_id: int) -> None:
+        cls._discard_user(user_id)
+        async with session_scope() as session:
+            await cache_invalidator.publish(session, 'user', str(user_id))
+            await session.commit()
 
     @staticmethod
     async def get_current_user(request: Request) -> SUser | None:
@@ -110,13 +171,26 @@ class UserRepository:
         except Exception:
             raise HTTPException(status_code=302, detail="Not authenticated")
 
+    @classmethod
+    async def require_api_auth(cls, request: Request) -> SUser:
+        try:
+            token = cls.get_access_token(request)
+            return await cls.get_current_user_by_token(token)
+        except HTTPException:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail='Not authenticated',
+                headers={'WWW-Authenticate': 'Bearer'},
+            )
+
     @classmethod
     async def login_user(cls, user_data: SLoginUser) -> str:
         existing_user = await cls.user_exists(user_data)
         if not existing_user:
             raise ValueError('Invalid email')
 
-        if not cls.verify_password(user_data.password, existing_user.password_hash):
+        await release_request_session()
+        if not await cls.verify_password(user_data.password, existing_user.password_hash):
             raise ValueError('Invalid password')
 
         token_data = {
@@ -129,17 +203,21 @@ class UserRepository:
 
     @classmethod
     async def register_user(cls, user_data: SCreateUser) -> str:
-        async with async_session_maker() as session:
-            if await cls.user_exists(user_data):
-                raise ValueError('User already exists')
-
+        with primary_reads():
+            existing_user = await cls.user_exists(user_data)
+        if existing_user:
+            raise ValueError('User already exists')
+
+        await release_request_session()
+        password_hash = await cls.get_password_hash(user_data.password)
+        async with session_scope() as session:
             new_user = User(
                 email=user_data.email,
-                password_hash = cls.get_password_hash(user_data.password)
+                password_hash=password_hash
             )
             session.add(new_user)
+            await session.flush()
             await session.commit()
-            await session.refresh(new_user)
 
             token_data = {
                 'sub': str(new_user.id),
@@ -147,4 +225,10 @@ class UserRepository:
             }
             access_token = cls.create_access_token(token_data)
 
-            return access_token
\ No newline at end of file
+            return access_token
+
+
+registry.register('user_cache', user_cache.stats)
+cache_invalidator.subscribe('token', user_cache.discard)
+cache_invalidator.subscribe('user', UserRepository._discard_user)
+cache_invalidator.subscribe(RESET, lambda _: user_cache.clear())
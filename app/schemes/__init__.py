@@ -1,5 +1,6 @@
 from .userSchemes import SUser, SLoginUser, SCreateUser
-from .linkSchemes import SLink, SLinkCreate
+from .clickSchemes import SClickBucket, SLinkStats, Granularity
+from .linkSchemes import SLink, SLinkCreate, SLinkTarget, SLinkPage, SLinkTotals, LinkSort
 
 __all__ = [
     "SUser",
@@ -7,4 +8,11 @@ __all__ = [
     "SCreateUser",
     "SLink",
     "SLinkCreate",
+    "SLinkTarget",
+    "SLinkPage",
+    "SLinkTotals",
+    "LinkSort",
+    "SClickBucket",
+    "SLinkStats",
+    "Granularity",
 ]
\ No newline at end of file
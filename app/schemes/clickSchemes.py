@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Dict, List, Literal
+
+from pydantic import BaseModel
+
+Granularity = Literal['minute', 'hour', 'day']
+
+class SClickBucket(BaseModel):
+    bucket_start: datetime
+    clicks: int
+
+class SLinkStats(BaseModel):
+    link_id: int
+    granularity: Granularity
+    since: datetime
+    until: datetime
+    total_clicks: int
+    unique_visitors: int
+    series: List[SClickBucket]
+    countries: Dict[str, int]
+    devices: Dict[str, int]
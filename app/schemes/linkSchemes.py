@@ -1,16 +1,47 @@
-from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Literal
+
+from pydantic import BaseModel, Field
+
+LinkSort = Literal['newest', 'oldest', 'popular']
 
 class SLink(BaseModel):
     id: int
     original_url: str
     short_code: str
     clicks_count: int
+    unique_visitors: int = 0
+    expires_at: datetime | None = None
+    max_clicks: int | None = None
+    created_at: datetime
 
     class Config:
         from_attributes = True
 
 class SLinkCreate(BaseModel):
     original_url: str
+    expires_at: datetime | None = None
+    max_clicks: int | None = Field(default=None, ge=1)
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class SLinkTarget(BaseModel):
+    id: int
+    original_url: str
+    expires_at: datetime | None = None
+    clicks_remaining: int | None = None
+
+
+class SLinkPage(BaseModel):
+    links: List[SLink]
+    sort: LinkSort
+    next_cursor: str | None = None
+
+
+class SLinkTotals(BaseModel):
+    total_links: int
+    total_clicks: int
+    total_unique_visitors: int = 0
+    last_link_id: int | None = None
+    last_modified: datetime | None = None
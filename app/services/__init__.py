@@ -0,0 +1,43 @@
+from .cacheInvalidator import CacheInvalidator, cache_invalidator
+from .clickCounter import ClickCounter, click_counter
+from .clickEnrichment import ClickEnricher, DeviceClassifier, GeoIPIndex, click_enricher
+from .clickPartitions import ClickPartitionManager, click_partition_manager
+from .clickPipeline import ClickEvent, ClickPipeline, click_pipeline
+from .clickRollup import ClickRollupJob, click_rollup_job
+from .linkSweeper import LinkSweeper, link_sweeper
+from .passwordHasher import PasswordHasher, password_hasher
+from .shortCodeFilter import ShortCodeFilter, short_code_filter
+from .shortCodeAllocator import (
+    ShortCodeAllocator,
+    RandomShortCodeAllocator,
+    SequenceShortCodeAllocator,
+    short_code_allocator,
+)
+
+__all__ = [
+    'CacheInvalidator',
+    'cache_invalidator',
+    'ClickCounter',
+    'click_counter',
+    'ClickEnricher',
+    'DeviceClassifier',
+    'GeoIPIndex',
+    'click_enricher',
+    'ClickPartitionManager',
+    'click_partition_manager',
+    'ClickEvent',
+    'ClickPipeline',
+    'click_pipeline',
+    'ClickRollupJob',
+    'click_rollup_job',
+    'LinkSweeper',
+    'link_sweeper',
+    'PasswordHasher',
+    'password_hasher',
+    'ShortCodeFilter',
+    'short_code_filter',
+    'ShortCodeAllocator',
+    'RandomShortCodeAllocator',
+    'SequenceShortCodeAllocator',
+    'short_code_allocator',
+]
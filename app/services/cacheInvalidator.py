@@ -0,0 +1,122 @@
+import asyncio
+import json
+import logging
+import os
+import uuid
+from collections import defaultdict
+from contextlib import suppress
+from typing import Callable
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.database import DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+RESET = 'reset'
+MAX_PAYLOAD_KEYS = 200
+
+
+class CacheInvalidator:
+    def __init__(self, channel: str, reconnect_delay: float):
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.origin = f'{os.getpid()}-{uuid.uuid4().hex[:8]}'
+        self.enabled = make_url(DATABASE_URL).get_backend_name() == 'postgresql'
+        self._handlers: dict[str, list[Callable[[str], None]]] = defaultdict(list)
+        self._task: asyncio.Task | None = None
+        self.published = 0
+        self.received = 0
+        self.reconnects = 0
+
+    def subscribe(self, kind: str, handler: Callable[[str], None]) -> None:
+        self._handlers[kind].append(handler)
+
+    async def publish(self, session: AsyncSession, kind: str, *keys: str) -> None:
+        if not self.enabled:
+            return
+
+        for start in range(0, len(keys), MAX_PAYLOAD_KEYS):
+            payload = json.dumps({
+                'origin': self.origin,
+                'kind': kind,
+                'keys': [str(key) for key in keys[start:start + MAX_PAYLOAD_KEYS]],
+            })
+            await session.execute(select(func.pg_notify(self.channel, payload)))
+            self.published += 1
+
+    def dispatch(self, kind: str, keys: list[str]) -> None:
+        for handler in self._handlers.get(kind, ()):
+            for key in keys:
+                try:
+                    handler(key)
+                except Exception:
+                    logger.exception('Cache invalidation handler failed for %s', kind)
+
+    def _on_notification(self, connection, pid, channel, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        if message.get('origin') == self.origin:
+            return
+
+        self.received += 1
+        self.dispatch(message.get('kind', ''), message.get('keys', []))
+
+    async def _listen(self) -> None:
+        import asyncpg
+
+        url = make_url(DATABASE_URL).set(drivername='postgresql')
+        connection = await asyncpg.connect(url.render_as_string(hide_password=False))
+        closed = asyncio.Event()
+        connection.add_termination_listener(lambda _: closed.set())
+        try:
+            await connection.add_listener(self.channel, self._on_notification)
+            if self.reconnects:
+                self.dispatch(RESET, [''])
+            await closed.wait()
+        finally:
+            with suppress(Exception):
+                await connection.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except Exception:
+                logger.exception('Cache invalidation listener failed, reconnecting')
+            self.reconnects += 1
+            await asyncio.sleep(self.reconnect_delay)
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            'enabled': self.enabled,
+            'listening': self._task is not None and not self._task.done(),
+            'published': self.published,
+            'received': self.received,
+            'reconnects': self.reconnects,
+        }
+
+
+cache_invalidator = CacheInvalidator(
+    channel=settings.CACHE_INVALIDATION_CHANNEL,
+    reconnect_delay=settings.CACHE_INVALIDATION_RECONNECT_DELAY,
+)
+registry.register('cache_invalidator', cache_invalidator.stats)
+
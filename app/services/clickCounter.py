@@ -0,0 +1,120 @@
+import asyncio
+import logging
+from collections import defaultdict
+from contextlib import suppress
+
+from sqlalchemy import Integer, bindparam, column, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.database import async_session_maker
+from app.models.link import Link
+
+logger = logging.getLogger(__name__)
+
+FLUSH_CHUNK_SIZE = 1000
+
+
+class ClickCounter:
+    def __init__(self, flush_interval: float, flush_threshold: int):
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._pending: defaultdict[int, int] = defaultdict(int)
+        self._flush_requested = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.flushed_clicks = 0
+
+    def increment(self, link_id: int, delta: int = 1) -> None:
+        self._pending[link_id] += delta
+        if len(self._pending) >= self.flush_threshold:
+            self._flush_requested.set()
+
+    def _restore(self, deltas: list[tuple[int, int]]) -> None:
+        for link_id, delta in deltas:
+            self._pending[link_id] += delta
+
+    async def _apply(self, session: AsyncSession, deltas: list[tuple[int, int]]) -> None:
+        if session.get_bind().dialect.name == 'postgresql':
+            rows = values(column('id', Integer), column('delta', Integer), name='deltas').data(deltas)
+            query = (
+                update(Link)
+                .where(Link.id == rows.c.id)
+                .values(clicks_count=Link.clicks_count + rows.c.delta)
+            )
+            await session.execute(query)
+            return
+
+        links = Link.__table__
+        query = (
+            update(links)
+            .where(links.c.id == bindparam('link_id'))
+            .values(clicks_count=links.c.clicks_count + bindparam('delta'))
+        )
+        connection = await session.connection()
+        await connection.execute(query, [{'link_id': link_id, 'delta': delta} for link_id, delta in deltas])
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._pending:
+                return
+
+            pending, self._pending = self._pending, defaultdict(int)
+            deltas = sorted(pending.items())
+
+            for start in range(0, len(deltas), FLUSH_CHUNK_SIZE):
+                chunk = deltas[start:start + FLUSH_CHUNK_SIZE]
+                try:
+                    async with async_session_maker() as session:
+                        await self._apply(session, chunk)
+                        await session.commit()
+                except asyncio.CancelledError:
+                    self._restore(deltas[start:])
+                    raise
+                except Exception:
+                    logger.exception('Failed to flush %d click counters', len(deltas) - start)
+                    self._restore(deltas[start:])
+                    self.failed_flushes += 1
+                    return
+                self.flushed_clicks += sum(delta for _, delta in chunk)
+
+            self.flushes += 1
+
+    async def _run(self) -> None:
+        while True:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            self._flush_requested.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            'pending_links': len(self._pending),
+            'pending_clicks': sum(self._pending.values()),
+            'flushes': self.flushes,
+            'failed_flushes': self.failed_flushes,
+            'flushed_clicks': self.flushed_clicks,
+        }
+
+
+click_counter = ClickCounter(
+    flush_interval=settings.CLICK_FLUSH_INTERVAL,
+    flush_threshold=settings.CLICK_FLUSH_THRESHOLD,
+)
+registry.register('click_counter', click_counter.stats)
+
@@ -0,0 +1,170 @@
+import asyncio
+import csv
+import ipaddress
+import mmap
+import re
+import socket
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+UNKNOWN = 'unknown'
+GEOIP_MAGIC = b'GEO1'
+GEOIP_HEADER = struct.Struct('<4sI')
+
+BOT_PATTERN = re.compile(r'bot|crawl|spider|slurp|curl|wget|python-requests|httpx|headless|preview', re.I)
+TABLET_PATTERN = re.compile(r'ipad|tablet|kindle|silk|playbook|android(?!.*mobile)', re.I)
+MOBILE_PATTERN = re.compile(r'mobi|iphone|ipod|android|windows phone|blackberry|opera mini', re.I)
+DESKTOP_PATTERN = re.compile(r'windows nt|macintosh|x11|linux|cros', re.I)
+
+
+class DeviceClassifier:
+    def __init__(self, cache_size: int):
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+
+    @staticmethod
+    def _classify(user_agent: str) -> str:
+        if not user_agent:
+            return UNKNOWN
+        if BOT_PATTERN.search(user_agent):
+            return 'bot'
+        if TABLET_PATTERN.search(user_agent):
+            return 'tablet'
+        if MOBILE_PATTERN.search(user_agent):
+            return 'mobile'
+        if DESKTOP_PATTERN.search(user_agent):
+            return 'desktop'
+        return UNKNOWN
+
+    def stats(self) -> dict:
+        info = self.classify.cache_info()
+        return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'maxsize': info.maxsize}
+
+
+class GeoIPIndex:
+    def __init__(self):
+        self._starts = array('I')
+        self._ends = array('I')
+        self._countries = b''
+        self._view: memoryview | None = None
+        self._mmap: mmap.mmap | None = None
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    @staticmethod
+    def _parse_address(value: str) -> int:
+        return int(value) if value.isdigit() else int(ipaddress.IPv4Address(value))
+
+    @classmethod
+    def read_csv(cls, path: Path) -> tuple[array, array, bytes]:
+        ranges = []
+        with open(path, newline='') as file:
+            for row in csv.reader(file):
+                if len(row) < 3 or row[0].startswith('#'):
+                    continue
+                try:
+                    start, end = cls._parse_address(row[0].strip()), cls._parse_address(row[1].strip())
+                except ValueError:
+                    continue
+                country = row[2].strip().upper()[:2].ljust(2, 'Z')
+                ranges.append((start, end, country.encode('ascii')))
+
+        ranges.sort()
+        starts = array('I', (start for start, _, _ in ranges))
+        ends = array('I', (end for _, end, _ in ranges))
+        countries = b''.join(country for _, _, country in ranges)
+        return starts, ends, countries
+
+    @classmethod
+    def write_binary(cls, csv_path: Path, binary_path: Path) -> int:
+        starts, ends, countries = cls.read_csv(csv_path)
+        if sys.byteorder != 'little':
+            starts.byteswap()
+            ends.byteswap()
+        with open(binary_path, 'wb') as file:
+            file.write(GEOIP_HEADER.pack(GEOIP_MAGIC, len(starts)))
+            file.write(starts.tobytes())
+            file.write(ends.tobytes())
+            file.write(countries)
+        return len(starts)
+
+    def load(self, path: str | Path) -> None:
+        path = Path(path)
+        self.close()
+
+        if path.suffix == '.csv':
+            self._starts, self._ends, self._countries = self.read_csv(path)
+            return
+
+        with open(path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = GEOIP_HEADER.unpack_from(mapped)
+        if magic != GEOIP_MAGIC or sys.byteorder != 'little':
+            mapped.close()
+            raise ValueError(f'Unsupported GeoIP database: {path}')
+
+        view = memoryview(mapped)
+        offset = GEOIP_HEADER.size
+        self._starts = view[offset:offset + 4 * count].cast('I')
+        self._ends = view[offset + 4 * count:offset + 8 * count].cast('I')
+        self._countries = view[offset + 8 * count:offset + 10 * count]
+        self._view = view
+        self._mmap = mapped
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            for view in (self._starts, self._ends, self._countries, self._view):
+                view.release()
+            self._mmap.close()
+            self._view = None
+            self._mmap = None
+        self._starts, self._ends, self._countries = array('I'), array('I'), b''
+
+    def lookup(self, ip_address: str) -> str:
+        try:
+            address = int.from_bytes(socket.inet_pton(socket.AF_INET, ip_address), 'big')
+        except OSError:
+            return UNKNOWN
+
+        index = bisect_right(self._starts, address) - 1
+        if index < 0 or address > self._ends[index]:
+            return UNKNOWN
+        return bytes(self._countries[2 * index:2 * index + 2]).decode('ascii')
+
+
+class ClickEnricher:
+    def __init__(self, ua_cache_size: int, geoip_path: str | None):
+        self.devices = DeviceClassifier(ua_cache_size)
+        self.countries = GeoIPIndex()
+        self.geoip_path = geoip_path
+
+    async def open(self) -> None:
+        if self.geoip_path:
+            await asyncio.to_thread(self.countries.load, self.geoip_path)
+
+    def close(self) -> None:
+        self.countries.close()
+
+    def enrich(self, ip_address: str, user_agent: str) -> tuple[str, str]:
+        return self.countries.lookup(ip_address), self.devices.classify(user_agent)
+
+    def stats(self) -> dict:
+        return {'geoip_ranges': len(self.countries), 'user_agents': self.devices.stats()}
+
+
+click_enricher = ClickEnricher(ua_cache_size=settings.UA_CACHE_SIZE, geoip_path=settings.GEOIP_DB_PATH)
+registry.register('click_enricher', click_enricher.stats)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        sys.exit('Usage: python -m app.services.clickEnrichment <ranges.csv> <ranges.bin>')
+    written = GeoIPIndex.write_binary(Path(sys.argv[1]), Path(sys.argv[2]))
+    print(f'Wrote {written} ranges to {sys.argv[2]}')
@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import re
+from contextlib import suppress
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.database import advisory_lock, async_session_maker, engine
+from app.models.click import Click
+from app.models.rollup import RollupWatermark
+from app.services.clickRollup import WATERMARK
+
+logger = logging.getLogger(__name__)
+
+TABLE = Click.__tablename__
+UPPER_BOUND = re.compile(r"TO \('([^']+)'\)")
+LOCK_TIMEOUT = '5s'
+
+
+def partition_start(moment: datetime, interval: str) -> datetime:
+    moment = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == 'month':
+        moment = moment.replace(day=1)
+    return moment
+
+
+def next_boundary(moment: datetime, interval: str) -> datetime:
+    if interval == 'day':
+        return partition_start(moment, interval) + timedelta(days=1)
+    return partition_start(moment.replace(day=28) + timedelta(days=4), interval)
+
+
+class ClickPartitionManager:
+    def __init__(self, interval: str, premake: int, check_interval: float, retention: timedelta | None):
+        self.interval = interval
+        self.premake = premake
+        self.check_interval = check_interval
+        self.retention = retention
+        self._task: asyncio.Task | None = None
+        self.partitioned: bool | None = None
+        self.runs = 0
+        self.failed_runs = 0
+        self.skipped_runs = 0
+        self.partitions = 0
+        self.created_partitions = 0
+        self.dropped_partitions = 0
+        self.retained_partitions = 0
+        self.covered_until: datetime | None = None
+
+    @staticmethod
+    def _quote(name: str) -> str:
+        return engine.dialect.identifier_preparer.quote(name)
+
+    @staticmethod
+    async def _partitions(session: AsyncSession) -> list[tuple[str, datetime | None]]:
+        result = await session.execute(
+            text(
+                'SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i '
+                'JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = to_regclass(:table)'
+            ),
+            {'table': TABLE},
+        )
+        partitions = []
+        for name, bound in result:
+            match = UPPER_BOUND.search(bound)
+            partitions.append((name, datetime.fromisoformat(match.group(1)) if match else None))
+        return partitions
+
+    @staticmethod
+    async def _execute_ddl(statement: str) -> None:
+        async with async_session_maker() as session:
+            await session.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+            await session.execute(text(statement))
+            await session.commit()
+
+    async def _create_partitions(self, now: datetime, covered_until: datetime | None) -> int:
+        horizon = partition_start(now, self.interval)
+        for _ in range(self.premake + 1):
+            horizon = next_boundary(horizon, self.interval)
+
+        created = 0
+        start = covered_until or partition_start(now, self.interval)
+        while start < horizon:
+            end = next_boundary(start, self.interval)
+            await self._execute_ddl(
+                f'CREATE TABLE IF NOT EXISTS {self._quote(f"{TABLE}_p{start:%Y%m%d}")} PARTITION OF {TABLE} '
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+            created += 1
+            start = end
+
+        self.covered_until = start
+        return created
+
+    async def _drop_expired(self, partitions: list[tuple[str, datetime | None]], cutoff: datetime) -> int:
+        async with async_session_maker() as session:
+            watermark = await session.scalar(
+                select(RollupWatermark.last_click_id).where(RollupWatermark.name == WATERMARK)
+            ) or 0
+
+        dropped = 0
+        retained = 0
+        for name, upper in partitions:
+            if upper is None or upper > cutoff:
+                continue
+            async with async_session_maker() as session:
+                pending = await session.scalar(
+                    text(f'SELECT EXISTS (SELECT 1 FROM {self._quote(name)} WHERE id > :watermark)'),
+                    {'watermark': watermark},
+                )
+            if pending:
+                logger.warning('Keeping click partition %s until its clicks are rolled up', name)
+                retained += 1
+                continue
+            await self._execute_ddl(f'DROP TABLE {self._quote(name)}')
+            dropped += 1
+
+        self.retained_partitions = retained
+        return dropped
+
+    async def run_once(self) -> None:
+        async with advisory_lock('click_partitions') as acquired:
+            if not acquired:
+                self.skipped_runs += 1
+                return
+            await self._maintain()
+
+    async def _maintain(self) -> None:
+        async with async_session_maker() as session:
+            partitioned = await session.scalar(
+                text('SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table))'),
+                {'table': TABLE},
+            )
+            now = await session.scalar(select(func.localtimestamp()))
+            partitions = await self._partitions(session) if partitioned else []
+
+        if not partitioned:
+            if self.partitioned is not False:
+                logger.info('The %s table is not partitioned, partition maintenance is disabled', TABLE)
+            self.partitioned = False
+            return
+        self.partitioned = True
+
+        covered_until = max((upper for _, upper in partitions if upper is not None), default=None)
+        created = await self._create_partitions(now, covered_until)
+        self.created_partitions += created
+
+        dropped = 0
+        if self.retention is not None:
+            dropped = await self._drop_expired(partitions, now - self.retention)
+            self.dropped_partitions += dropped
+
+        self.partitions = len(partitions) + created - dropped
+        self.runs += 1
+
+    async def _safe_run(self) -> None:
+        try:
+            await self.run_once()
+        except Exception:
+            self.failed_runs += 1
+            logger.exception('Failed to maintain click partitions')
+
+    async def open(self) -> None:
+        if engine.dialect.name == 'postgresql':
+            await self._safe_run()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self._safe_run()
+
+    def start(self) -> None:
+        if engine.dialect.name != 'postgresql':
+            logger.info('Click partitioning requires PostgreSQL, partition maintenance is disabled')
+            return
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            'runs': self.runs,
+            'failed_runs': self.failed_runs,
+            'skipped_runs': self.skipped_runs,
+            'partitioned': bool(self.partitioned),
+            'partitions': self.partitions,
+            'created_partitions': self.created_partitions,
+            'dropped_partitions': self.dropped_partitions,
+            'retained_partitions': self.retained_partitions,
+            'covered_until': self.covered_until.isoformat() if self.covered_until else None,
+        }
+
+
+click_partition_manager = ClickPartitionManager(
+    interval=settings.CLICK_PARTITION_INTERVAL,
+    premake=settings.CLICK_PARTITION_PREMAKE,
+    check_interval=settings.CLICK_PARTITION_CHECK_INTERVAL,
+    retention=timedelta(days=settings.CLICK_RETENTION_DAYS) if settings.CLICK_RETENTION_DAYS else None,
+)
+registry.register('click_partition_manager', click_partition_manager.stats)
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+from contextlib import suppress
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.database import async_session_maker
+from app.models.click import Click
+from app.models.link import Link
+from app.services.clickEnrichment import ClickEnricher, click_enricher
+
+logger = logging.getLogger(__name__)
+
+STOP = object()
+
+
+@dataclass(slots=True)
+class ClickEvent:
+    link_id: int
+    ip_address: str
+    user_agent: str
+    created_at: datetime = field(default_factory=datetime.now)
+
+
+class ClickPipeline:
+    def __init__(self, enricher: ClickEnricher, maxsize: int, batch_size: int, linger: float, policy: str):
+        if policy not in ('drop', 'block'):
+            raise ValueError(f'Unknown click queue policy: {policy}')
+
+        self.enricher = enricher
+        self.batch_size = batch_size
+        self.linger = linger
+        self.policy = policy
+        self._queue: asyncio.Queue[ClickEvent | object] = asyncio.Queue(maxsize=maxsize)
+        self._task: asyncio.Task | None = None
+        self.enqueued = 0
+        self.dropped = 0
+        self.inserted = 0
+        self.batches = 0
+        self.failed_batches = 0
+
+    async def submit(self, event: ClickEvent) -> None:
+        if self.policy == 'block':
+            await self._queue.put(event)
+        else:
+            try:
+                self._queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                return
+        self.enqueued += 1
+
+    def _to_row(self, event: ClickEvent) -> dict:
+        country_code, device_type = self.enricher.enrich(event.ip_address, event.user_agent)
+        return {
+            'link_id': event.link_id,
+            'ip_address': event.ip_address,
+            'country_code': country_code,
+            'device_type': device_type,
+            'created_at': event.created_at,
+        }
+
+    async def _insert(self, rows: list[dict]) -> None:
+        async with async_session_maker() as session:
+            try:
+                await session.execute(insert(Click), rows)
+                await session.commit()
+                return
+            except IntegrityError:
+                await session.rollback()
+
+            link_ids = {row['link_id'] for row in rows}
+            result = await session.execute(select(Link.id).where(Link.id.in_(link_ids)))
+            existing = set(result.scalars().all())
+            rows = [row for row in rows if row['link_id'] in existing]
+            if rows:
+                await session.execute(insert(Click), rows)
+                await session.commit()
+
+    async def _write(self, batch: list[ClickEvent]) -> None:
+        rows = [self._to_row(event) for event in batch]
+        try:
+            await self._insert(rows)
+        except Exception:
+            logger.exception('Failed to insert %d click events', len(batch))
+            self.failed_batches += 1
+            return
+        self.batches += 1
+        self.inserted += len(rows)
+
+    async def _next_batch(self) -> tuple[list[ClickEvent], bool]:
+        loop = asyncio.get_running_loop()
+        event = await self._queue.get()
+        if event is STOP:
+            return [], True
+        batch = [event]
+        deadline = loop.time() + self.linger
+
+        while len(batch) < self.batch_size:
+            try:
+                event = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+            if event is STOP:
+                return batch, True
+            batch.append(event)
+        return batch, False
+
+    async def _run(self) -> None:
+        while True:
+            batch, stopping = await self._next_batch()
+            if batch:
+                await self._write(batch)
+            if stopping:
+                return
+
+    async def _drain(self) -> None:
+        while not self._queue.empty():
+            batch = []
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self._write(batch)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            if not self._task.done():
+                await self._queue.put(STOP)
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self._drain()
+
+    def stats(self) -> dict:
+        return {
+            'queue_depth': self._queue.qsize(),
+            'queue_maxsize': self._queue.maxsize,
+            'enqueued': self.enqueued,
+            'dropped': self.dropped,
+            'inserted': self.inserted,
+            'batches': self.batches,
+            'failed_batches': self.failed_batches,
+        }
+
+
+click_pipeline = ClickPipeline(
+    enricher=click_enricher,
+    maxsize=settings.CLICK_QUEUE_SIZE,
+    batch_size=settings.CLICK_BATCH_SIZE,
+    linger=settings.CLICK_LINGER,
+    policy=settings.CLICK_QUEUE_POLICY,
+)
+registry.register('click_pipeline', click_pipeline.stats)
+
@@ -0,0 +1,255 @@
+import asyncio
+import logging
+from contextlib import suppress
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from sqlalchemy import bindparam, delete, func, literal_column, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.database import async_session_maker, engine
+from app.core.hyperloglog import HyperLogLog
+from app.models.click import Click
+from app.models.link import Link
+from app.models.rollup import ClickRollup, RollupWatermark, VisitorRollup
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ('minute', 'hour', 'day')
+WATERMARK = 'clicks'
+ROLLUP_KEY = ('link_id', 'granularity', 'bucket_start', 'country_code', 'device_type')
+SKETCH_GRANULARITIES = ('hour', 'day')
+SKETCH_CHUNK_SIZE = 1000
+
+
+def truncate(moment: datetime, granularity: str) -> datetime:
+    moment = moment.replace(second=0, microsecond=0)
+    if granularity in ('hour', 'day'):
+        moment = moment.replace(minute=0)
+    if granularity == 'day':
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def chunked(items: list, size: int) -> Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class ClickRollupJob:
+    def __init__(self, interval: float, batch_size: int, lag: float, minute_retention: timedelta,
+                 precision: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.lag = lag
+        self.minute_retention = minute_retention
+        self.precision = precision
+        self._task: asyncio.Task | None = None
+        self.runs = 0
+        self.failed_runs = 0
+        self.processed_clicks = 0
+        self.last_click_id = 0
+
+    @staticmethod
+    def _rollup_query(granularity: str, low: int, high: int):
+        bucket = func.date_trunc(literal_column(f"'{granularity}'"), Click.created_at)
+        source = (
+            select(
+                Click.link_id,
+                literal_column(f"'{granularity}'"),
+                bucket,
+                Click.country_code,
+                Click.device_type,
+                func.count(),
+            )
+            .where(Click.id > low, Click.id <= high)
+            .group_by(Click.link_id, bucket, Click.country_code, Click.device_type)
+        )
+        query = pg_insert(ClickRollup).from_select(list(ROLLUP_KEY) + ['clicks'], source)
+        return query.on_conflict_do_update(
+            index_elements=list(ROLLUP_KEY),
+            set_={'clicks': ClickRollup.clicks + query.excluded.clicks, 'updated_at': func.now()},
+        )
+
+    def _merge_stored(self, sketch: HyperLogLog, data: bytes | None) -> None:
+        if data is None:
+            return
+        stored = HyperLogLog.from_bytes(data)
+        if stored.precision == sketch.precision:
+            sketch.merge(stored)
+
+    def _build_sketches(self, rows: list) -> tuple[dict, dict]:
+        link_sketches: dict[int, HyperLogLog] = {}
+        bucket_sketches: dict[tuple[int, str, datetime], HyperLogLog] = {}
+        for link_id, created_at, ip_address in rows:
+            if link_id not in link_sketches:
+                link_sketches[link_id] = HyperLogLog(self.precision)
+            link_sketches[link_id].add(ip_address)
+
+            for granularity in SKETCH_GRANULARITIES:
+                key = (link_id, granularity, truncate(created_at, granularity))
+                if key not in bucket_sketches:
+                    bucket_sketches[key] = HyperLogLog(self.precision)
+                bucket_sketches[key].add(ip_address)
+        return link_sketches, bucket_sketches
+
+    def _merge_sketches(self, link_sketches: dict, stored_links: list, bucket_sketches: dict,
+                        stored_buckets: list) -> tuple[list[dict], list[dict]]:
+        for link_id, data in stored_links:
+            self._merge_stored(link_sketches[link_id], data)
+        for link_id, granularity, bucket_start, data in stored_buckets:
+            self._merge_stored(bucket_sketches[(link_id, granularity, bucket_start)], data)
+
+        links = [
+            {'link_id': link_id, 'sketch': sketch.to_bytes(), 'visitors': sketch.count()}
+            for link_id, sketch in link_sketches.items()
+        ]
+        buckets = [
+            {'link_id': link_id, 'granularity': granularity, 'bucket_start': bucket_start, 'sketch': sketch.to_bytes()}
+            for (link_id, granularity, bucket_start), sketch in bucket_sketches.items()
+        ]
+        return links, buckets
+
+    async def _update_sketches(self, session: AsyncSession, low: int, high: int) -> None:
+        result = await session.execute(
+            select(Click.link_id, Click.created_at, Click.ip_address)
+            .where(Click.id > low, Click.id <= high)
+        )
+        link_sketches, bucket_sketches = await asyncio.to_thread(self._build_sketches, result.all())
+        if not link_sketches:
+            return
+
+        stored_links = []
+        for link_ids in chunked(list(link_sketches), SKETCH_CHUNK_SIZE):
+            result = await session.execute(
+                select(Link.id, Link.visitors_hll).where(Link.id.in_(link_ids))
+            )
+            stored_links.extend(result.all())
+        stored_buckets = []
+        for keys in chunked(list(bucket_sketches), SKETCH_CHUNK_SIZE):
+            result = await session.execute(
+                select(VisitorRollup.link_id, VisitorRollup.granularity, VisitorRollup.bucket_start,
+                       VisitorRollup.sketch)
+                .where(tuple_(VisitorRollup.link_id, VisitorRollup.granularity, VisitorRollup.bucket_start)
+                       .in_(keys))
+            )
+            stored_buckets.extend(result.all())
+        links, buckets = await asyncio.to_thread(
+            self._merge_sketches, link_sketches, stored_links, bucket_sketches, stored_buckets
+        )
+
+        table = Link.__table__
+        connection = await session.connection()
+        await connection.execute(
+            update(table)
+            .where(table.c.id == bindparam('link_id'))
+            .values(visitors_hll=bindparam('sketch'), unique_visitors=bindparam('visitors')),
+            links,
+        )
+
+        for chunk in chunked(buckets, SKETCH_CHUNK_SIZE):
+            query = pg_insert(VisitorRollup).values(chunk)
+            await session.execute(query.on_conflict_do_update(
+                index_elements=['link_id', 'granularity', 'bucket_start'],
+                set_={'sketch': query.excluded.sketch, 'updated_at': func.now()},
+            ))
+
+    async def run_once(self) -> int:
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(RollupWatermark)
+                .where(RollupWatermark.name == WATERMARK)
+                .with_for_update(skip_locked=True)
+            )
+            watermark = result.scalar_one_or_none()
+            if watermark is None:
+                await session.execute(
+                    pg_insert(RollupWatermark).values(name=WATERMARK, last_click_id=0).on_conflict_do_nothing()
+                )
+                await session.commit()
+                return 0
+
+            low = watermark.last_click_id
+            cutoff = func.localtimestamp() - timedelta(seconds=self.lag)
+            batch = (
+                select(Click.id, Click.updated_at)
+                .where(Click.id > low)
+                .order_by(Click.id)
+                .limit(self.batch_size)
+                .cte('batch')
+            )
+            pending = select(func.min(batch.c.id)).where(batch.c.updated_at >= cutoff).scalar_subquery()
+            result = await session.execute(
+                select(func.max(batch.c.id), func.count(batch.c.id))
+                .where(or_(pending.is_(None), batch.c.id < pending))
+            )
+            high, processed = result.one()
+            if high is None:
+                await session.commit()
+                return 0
+
+            for granularity in GRANULARITIES:
+                await session.execute(self._rollup_query(granularity, low, high))
+            await self._update_sketches(session, low, high)
+
+            watermark.last_click_id = high
+            await session.execute(
+                delete(ClickRollup).where(
+                    ClickRollup.granularity == 'minute',
+                    ClickRollup.bucket_start < datetime.now() - self.minute_retention,
+                )
+            )
+            await session.commit()
+
+        self.last_click_id = high
+        self.processed_clicks += processed
+        return processed
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await self.run_once()
+                self.runs += 1
+            except Exception:
+                logger.exception('Click rollup run failed')
+                self.failed_runs += 1
+                processed = 0
+
+            if processed < self.batch_size:
+                await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if engine.dialect.name != 'postgresql':
+            logger.info('Click rollups require PostgreSQL, rollup job is disabled')
+            return
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            'runs': self.runs,
+            'failed_runs': self.failed_runs,
+            'processed_clicks': self.processed_clicks,
+            'last_click_id': self.last_click_id,
+        }
+
+
+click_rollup_job = ClickRollupJob(
+    interval=settings.ROLLUP_INTERVAL,
+    batch_size=settings.ROLLUP_BATCH_SIZE,
+    lag=settings.ROLLUP_LAG,
+    minute_retention=timedelta(hours=settings.ROLLUP_MINUTE_RETENTION_HOURS),
+    precision=settings.HLL_PRECISION,
+)
+registry.register('click_rollup_job', click_rollup_job.stats)
+
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from datetime import datetime, timezone
+
+from sqlalchemy import ColumnElement, delete, func, select
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.database import advisory_lock, async_session_maker
+from app.models.click import Click
+from app.models.link import Link
+from app.services.cacheInvalidator import cache_invalidator
+
+logger = logging.getLogger(__name__)
+
+
+class LinkSweeper:
+    def __init__(self, interval: float, batch_size: int, click_batch_size: int, max_batches: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.click_batch_size = click_batch_size
+        self.max_batches = max_batches
+        self._task: asyncio.Task | None = None
+        self.runs = 0
+        self.failed_runs = 0
+        self.skipped_runs = 0
+        self.swept_links = 0
+        self.swept_clicks = 0
+        self.last_run_links = 0
+        self.last_run_seconds = 0.0
+        self.backlog = 0
+
+    @staticmethod
+    def _conditions(now: datetime) -> tuple[ColumnElement[bool], ...]:
+        return (
+            Link.expires_at <= now,
+            Link.max_clicks.is_not(None) & (Link.clicks_count >= Link.max_clicks),
+        )
+
+    async def _delete_clicks(self, link_ids: list[int]) -> int:
+        deleted = 0
+        while True:
+            batch = select(Click.id).where(Click.link_id.in_(link_ids)).limit(self.click_batch_size)
+            async with async_session_maker() as session:
+                result = await session.execute(delete(Click).where(Click.id.in_(batch.scalar_subquery())))
+                await session.commit()
+            deleted += result.rowcount
+            if result.rowcount < self.click_batch_size:
+                return deleted
+
+    async def _sweep_batch(self, condition: ColumnElement[bool]) -> int:
+        query = select(Link.id).where(condition).order_by(Link.id).limit(self.batch_size)
+        async with async_session_maker() as session:
+            link_ids = list(await session.scalars(query))
+        if not link_ids:
+            return 0
+
+        self.swept_clicks += await self._delete_clicks(link_ids)
+
+        async with async_session_maker() as session:
+            result = await session.execute(
+                delete(Link).where(Link.id.in_(link_ids), condition).returning(Link.short_code)
+            )
+            short_codes = list(result.scalars())
+            await cache_invalidator.publish(session, 'link', *short_codes)
+            await session.commit()
+
+        cache_invalidator.dispatch('link', short_codes)
+        self.swept_links += len(short_codes)
+        return len(link_ids)
+
+    async def _count_backlog(self, now: datetime) -> int:
+        backlog = 0
+        async with async_session_maker() as session:
+            for condition in self._conditions(now):
+                backlog += await session.scalar(select(func.count()).select_from(Link).where(condition))
+        return backlog
+
+    async def _sweep(self) -> int:
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        swept = 0
+        batches = 0
+        for condition in self._conditions(now):
+            while batches < self.max_batches:
+                batch = await self._sweep_batch(condition)
+                batches += 1
+                swept += batch
+                if batch < self.batch_size:
+                    break
+
+        self.runs += 1
+        self.last_run_links = swept
+        self.last_run_seconds = time.perf_counter() - started
+        self.backlog = await self._count_backlog(now)
+        return swept
+
+    async def run_once(self) -> int:
+        async with advisory_lock('link_sweeper') as acquired:
+            if not acquired:
+                self.skipped_runs += 1
+                return 0
+            return await self._sweep()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                self.failed_runs += 1
+                logger.exception('Failed to sweep expired links')
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            'runs': self.runs,
+            'failed_runs': self.failed_runs,
+            'skipped_runs': self.skipped_runs,
+            'swept_links': self.swept_links,
+            'swept_clicks': self.swept_clicks,
+            'last_run_links': self.last_run_links,
+            'last_run_seconds': self.last_run_seconds,
+            'links_per_second': self.last_run_links / self.last_run_seconds if self.last_run_seconds else 0.0,
+            'backlog': self.backlog,
+        }
+
+
+link_sweeper = LinkSweeper(
+    interval=settings.LINK_SWEEP_INTERVAL,
+    batch_size=settings.LINK_SWEEP_BATCH_SIZE,
+    click_batch_size=settings.LINK_SWEEP_CLICK_BATCH_SIZE,
+    max_batches=settings.LINK_SWEEP_MAX_BATCHES,
+)
+registry.register('link_sweeper', link_sweeper.stats)
+
@@ -0,0 +1,70 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.metrics import Histogram, registry
+
+T = TypeVar('T')
+
+
+class PasswordHasher:
+    def __init__(self, context: CryptContext, workers: int, max_pending: int):
+        self._context = context
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hasher')
+        self._semaphore = asyncio.Semaphore(max_pending)
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.queue_time = Histogram()
+        self.run_time = Histogram()
+
+    async def _run(self, fn: Callable[..., T], *args) -> T:
+        def timed() -> tuple[float, float, T]:
+            started = time.perf_counter()
+            result = fn(*args)
+            return started, time.perf_counter(), result
+
+        self.pending += 1
+        submitted = time.perf_counter()
+        try:
+            async with self._semaphore:
+                loop = asyncio.get_running_loop()
+                started, finished, result = await loop.run_in_executor(self._executor, timed)
+        finally:
+            self.pending -= 1
+
+        self.queue_time.observe(started - submitted)
+        self.run_time.observe(finished - started)
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self._context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(self._context.verify, password, hashed_password)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> dict:
+        return {
+            'workers': self.workers,
+            'max_pending': self.max_pending,
+            'pending': self.pending,
+            'queue_time': self.queue_time.stats(),
+            'run_time': self.run_time.stats(),
+        }
+
+
+pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto', bcrypt__rounds=settings.BCRYPT_ROUNDS)
+password_hasher = PasswordHasher(
+    pwd_context,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+registry.register('password_hasher', password_hasher.stats)
+
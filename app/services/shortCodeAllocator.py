@@ -0,0 +1,129 @@
+import asyncio
+import hashlib
+import secrets
+import string
+from abc import ABC, abstractmethod
+from collections import deque
+
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.database import async_session_maker
+from app.models.link import short_code_seq
+
+ALPHABET = string.digits + string.ascii_letters
+
+
+class FeistelPermutation:
+    def __init__(self, key: bytes, domain: int, rounds: int = 4):
+        half_bits = ((domain - 1).bit_length() + 1) // 2
+        self.domain = domain
+        self.rounds = rounds
+        self._half_bits = half_bits
+        self._mask = (1 << half_bits) - 1
+        self._hashers = [
+            hashlib.blake2b(bytes([round_index]), key=hashlib.blake2b(key).digest(), digest_size=8)
+            for round_index in range(rounds)
+        ]
+
+    def _round(self, value: int, round_index: int) -> int:
+        hasher = self._hashers[round_index].copy()
+        hasher.update(value.to_bytes(8, 'big'))
+        return int.from_bytes(hasher.digest(), 'big') & self._mask
+
+    def _encrypt(self, value: int) -> int:
+        left, right = value >> self._half_bits, value & self._mask
+        for round_index in range(self.rounds):
+            left, right = right, left ^ self._round(right, round_index)
+        return (left << self._half_bits) | right
+
+    def permute(self, value: int) -> int:
+        if not 0 <= value < self.domain:
+            raise ValueError(f'Value {value} is outside of the permutation domain')
+
+        value = self._encrypt(value)
+        while value >= self.domain:
+            value = self._encrypt(value)
+        return value
+
+
+def encode_base62(value: int, length: int) -> str:
+    chars = []
+    for _ in range(length):
+        value, index = divmod(value, len(ALPHABET))
+        chars.append(ALPHABET[index])
+    return ''.join(reversed(chars))
+
+
+class ShortCodeAllocator(ABC):
+    @abstractmethod
+    async def allocate(self, count: int) -> list[str]:
+        ...
+
+    async def next_code(self) -> str:
+        codes = await self.allocate(1)
+        return codes[0]
+
+    def stats(self) -> dict:
+        return {}
+
+
+class RandomShortCodeAllocator(ShortCodeAllocator):
+    def __init__(self, length: int = 6):
+        self.length = length
+
+    async def allocate(self, count: int) -> list[str]:
+        return [
+            ''.join(secrets.choice(ALPHABET) for _ in range(self.length))
+            for _ in range(count)
+        ]
+
+
+class SequenceShortCodeAllocator(ShortCodeAllocator):
+    def __init__(self, key: bytes, length: int, block_size: int):
+        self.length = length
+        self.block_size = block_size
+        self._permutation = FeistelPermutation(key, len(ALPHABET) ** length)
+        self._ids: deque[int] = deque()
+        self._lock = asyncio.Lock()
+        self.leases = 0
+
+    async def _lease(self, count: int) -> list[int]:
+        query = select(short_code_seq.next_value()).select_from(func.generate_series(1, count))
+        async with async_session_maker() as session:
+            result = await session.execute(query)
+            return list(result.scalars().all())
+
+    def encode(self, value: int) -> str:
+        return encode_base62(self._permutation.permute(value), self.length)
+
+    async def allocate(self, count: int) -> list[str]:
+        async with self._lock:
+            if len(self._ids) < count:
+                self._ids.extend(await self._lease(max(self.block_size, count - len(self._ids))))
+                self.leases += 1
+            ids = [self._ids.popleft() for _ in range(count)]
+        return [self.encode(value) for value in ids]
+
+    def stats(self) -> dict:
+        return {
+            'available': len(self._ids),
+            'leases': self.leases,
+        }
+
+
+def create_short_code_allocator() -> ShortCodeAllocator:
+    if settings.SHORT_CODE_ALLOCATOR == 'random':
+        return RandomShortCodeAllocator()
+
+    key = (settings.SHORT_CODE_SECRET or settings.SECRET_KEY).encode()
+    return SequenceShortCodeAllocator(
+        key=key,
+        length=settings.SHORT_CODE_LENGTH,
+        block_size=settings.SHORT_CODE_BLOCK_SIZE,
+    )
+
+
+short_code_allocator = create_short_code_allocator()
+registry.register('short_code_allocator', short_code_allocator.stats)
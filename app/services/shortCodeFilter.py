@@ -0,0 +1,117 @@
+import asyncio
+import logging
+from contextlib import suppress
+
+from sqlalchemy import func, select
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.database import async_session_maker
+from app.models.link import Link
+
+logger = logging.getLogger(__name__)
+
+
+class ShortCodeFilter:
+    def __init__(self, enabled: bool, error_rate: float, min_capacity: int, headroom: float,
+                 rebuild_interval: float):
+        self.enabled = enabled
+        self.error_rate = error_rate
+        self.min_capacity = min_capacity
+        self.headroom = headroom
+        self.rebuild_interval = rebuild_interval
+        self._filter: BloomFilter | None = None
+        self._pending: set[str] | None = None
+        self._rebuild_requested = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.checks = 0
+        self.rejected = 0
+        self.rebuilds = 0
+
+    def might_exist(self, short_code: str) -> bool:
+        if self._filter is None:
+            return True
+
+        self.checks += 1
+        if short_code in self._filter:
+            return True
+        self.rejected += 1
+        return False
+
+    def add(self, short_code: str) -> None:
+        if self._pending is not None:
+            self._pending.add(short_code)
+        if self._filter is not None:
+            self._filter.add(short_code)
+            if self._filter.count > self._filter.capacity:
+                self.request_rebuild()
+
+    def request_rebuild(self) -> None:
+        self._rebuild_requested.set()
+
+    async def rebuild(self) -> None:
+        self._pending = set()
+        try:
+            async with async_session_maker() as session:
+                total = await session.scalar(select(func.count()).select_from(Link))
+                bloom = BloomFilter(max(self.min_capacity, int(total * self.headroom)), self.error_rate)
+
+                result = await session.stream_scalars(
+                    select(Link.short_code).execution_options(yield_per=10_000)
+                )
+                async for short_code in result:
+                    bloom.add(short_code)
+
+            for short_code in self._pending:
+                bloom.add(short_code)
+            self._filter = bloom
+            self.rebuilds += 1
+        finally:
+            self._pending = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.rebuild()
+            except Exception:
+                logger.exception('Failed to rebuild the short code filter')
+
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._rebuild_requested.wait(), timeout=self.rebuild_interval)
+            self._rebuild_requested.clear()
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            'ready': self._filter is not None,
+            'items': self._filter.count if self._filter else 0,
+            'capacity': self._filter.capacity if self._filter else 0,
+            'memory_bytes': self._filter.memory if self._filter else 0,
+            'hashes': self._filter.hashes if self._filter else 0,
+            'error_rate': self.error_rate,
+            'checks': self.checks,
+            'rejected': self.rejected,
+            'rebuilds': self.rebuilds,
+        }
+
+
+short_code_filter = ShortCodeFilter(
+    enabled=settings.BLOOM_ENABLED,
+    error_rate=settings.BLOOM_ERROR_RATE,
+    min_capacity=settings.BLOOM_MIN_CAPACITY,
+    headroom=settings.BLOOM_HEADROOM,
+    rebuild_interval=settings.BLOOM_REBUILD_INTERVAL,
+)
+registry.register('short_code_filter', short_code_filter.stats)
+
@@ -0,0 +1,15 @@
+// Передаём смещение часового пояса браузера, чтобы сервер понял локальное время окончания
+function attachUtcOffset(event) {
+    const form = event.target;
+    const expiresAt = form.elements['expires_at'];
+    const utcOffset = form.elements['utc_offset'];
+
+    if (!expiresAt || !utcOffset) return;
+
+    const moment = expiresAt.value ? new Date(expiresAt.value) : new Date();
+    utcOffset.value = -moment.getTimezoneOffset();
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    document.querySelectorAll('.link-form').forEach(form => form.addEventListener('submit', attachUtcOffset));
+});
\ No newline at end of file
@@ -0,0 +1,52 @@
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from benchmarks.runner import SCENARIOS, compare, configure_environment, run
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='URL shortener load benchmark')
+    subparsers = parser.add_subparsers(dest='command')
+
+    run_parser = subparsers.add_parser('run', help='Seed a database and drive load at the app')
+    run_parser.add_argument('--database-url', default='sqlite+aiosqlite:///bench.db',
+                            help='Throwaway database, it is dropped and recreated before the run')
+    run_parser.add_argument('--users', type=int, default=20)
+    run_parser.add_argument('--links', type=int, default=1000, help='Links per user')
+    run_parser.add_argument('--requests', type=int, default=2000, help='Requests per scenario')
+    run_parser.add_argument('--concurrency', type=int, default=32)
+    run_parser.add_argument('--skew', type=float, default=1.1, help='Zipf exponent for redirect popularity')
+    run_parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    run_parser.add_argument('--bcrypt-rounds', type=int, default=12)
+    run_parser.add_argument('--seed', type=int, default=42)
+    run_parser.add_argument('--output', type=Path, help='Result file, defaults to benchmarks/results/<commit>.json')
+
+    compare_parser = subparsers.add_parser('compare', help='Compare two result files')
+    compare_parser.add_argument('baseline', type=Path)
+    compare_parser.add_argument('candidate', type=Path)
+
+    args = parser.parse_args()
+    if args.command is None:
+        parser.print_help()
+        sys.exit(1)
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+
+    if args.command == 'compare':
+        baseline = json.loads(args.baseline.read_text())
+        candidate = json.loads(args.candidate.read_text())
+        print(compare(baseline, candidate))
+        return
+
+    configure_environment(args.database_url, args.bcrypt_rounds)
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
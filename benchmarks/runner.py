@@ -0,0 +1,264 @@
+import asyncio
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+SCENARIOS = ('redirect', 'create-link', 'dashboard', 'login')
+EXPECTED_STATUS = {
+    'redirect': {302},
+    'create-link': {303},
+    'dashboard': {200},
+    'login': {303},
+}
+PASSWORD = 'BenchPassword1'
+SEED_CHUNK_SIZE = 5000
+
+
+def configure_environment(database_url: str, bcrypt_rounds: int) -> None:
+    os.chdir(ROOT)
+    os.environ['DATABASE_URL'] = database_url
+    os.environ['BCRYPT_ROUNDS'] = str(bcrypt_rounds)
+    if not database_url.startswith('postgresql'):
+        os.environ['SHORT_CODE_ALLOCATOR'] = 'random'
+
+    defaults = {
+        'DATABASE_USER': 'bench',
+        'DATABASE_PASSWORD': 'bench',
+        'DATABASE_HOST': 'localhost',
+        'DATABASE_PORT': '5432',
+        'DATABASE_NAME': 'bench',
+        'SECRET_KEY': 'benchmark-secret-key-for-local-load-runs',
+        'ALGORITHM': 'HS256',
+        'DEBUG': 'false',
+    }
+    for key, value in defaults.items():
+        os.environ.setdefault(key, value)
+
+
+def git_revision() -> dict:
+    def git(*args: str) -> str:
+        try:
+            return subprocess.run(['git', *args], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+        except OSError:
+            return ''
+
+    return {'commit': git('rev-parse', 'HEAD'), 'dirty': bool(git('status', '--porcelain', '--untracked-files=no'))}
+
+
+async def seed(users: int, links_per_user: int) -> dict:
+    from sqlalchemy import insert
+
+    from app.core.database import Base, async_session_maker, engine
+    from app.models import Link, User
+    from app.repositories import UserRepository
+    from app.services.passwordHasher import pwd_context
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+    password_hash = pwd_context.hash(PASSWORD)
+    emails = [f'bench{index}@urlshortener-bench.com' for index in range(users)]
+
+    async with async_session_maker() as session:
+        result = await session.execute(
+            insert(User).returning(User.id, sort_by_parameter_order=True),
+            [{'email': email, 'password_hash': password_hash} for email in emails],
+        )
+        user_ids = list(result.scalars().all())
+
+        short_codes = []
+        rows = (
+            {
+                'original_url': f'https://example.com/{user_id}/{index}',
+                'short_code': f'bench-{user_id}-{index}',
+                'clicks_count': 0,
+                'user_id': user_id,
+            }
+            for user_id in user_ids
+            for index in range(links_per_user)
+        )
+        while chunk := list(itertools.islice(rows, SEED_CHUNK_SIZE)):
+            await session.execute(insert(Link), chunk)
+            short_codes.extend(row['short_code'] for row in chunk)
+        await session.commit()
+
+    tokens = [
+        UserRepository.create_access_token({'sub': str(user_id), 'email': email})
+        for user_id, email in zip(user_ids, emails)
+    ]
+    return {'emails': emails, 'tokens': tokens, 'short_codes': short_codes}
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(percent / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(latencies: list[float], statuses: Counter, errors: int, elapsed: float, expected: set[int]) -> dict:
+    latencies = sorted(latencies)
+    unexpected = sum(count for status, count in statuses.items() if status not in expected)
+    return {
+        'requests': len(latencies),
+        'elapsed': elapsed,
+        'throughput': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'max_ms': (latencies[-1] if latencies else 0.0) * 1000,
+        'errors': errors + unexpected,
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+
+async def drive(client: httpx.AsyncClient,
+                make_request: Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]],
+                total: int, concurrency: int, expected: set[int]) -> dict:
+    warmup = min(100, total // 10)
+    await asyncio.gather(*(make_request(client, index) for index in range(warmup)))
+
+    latencies = []
+    statuses = Counter()
+    errors = 0
+    indexes = iter(range(total))
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in indexes:
+            started = time.perf_counter()
+            try:
+                response = await make_request(client, index)
+                statuses[response.status_code] += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return summarize(latencies, statuses, errors, elapsed, expected)
+
+
+def build_requests(data: dict, skew: float,
+                   rng: random.Random) -> dict[str, Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]]:
+    short_codes = list(data['short_codes'])
+    rng.shuffle(short_codes)
+    weights = list(itertools.accumulate(1 / (rank + 1) ** skew for rank in range(len(short_codes))))
+    tokens = data['tokens']
+    emails = data['emails']
+
+    def auth(index: int) -> dict:
+        return {'cookie': f'access_token={tokens[index % len(tokens)]}'}
+
+    async def redirect(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        short_code = rng.choices(short_codes, cum_weights=weights)[0]
+        return await client.get(f'/r/{short_code}')
+
+    async def create_link(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        url = f'https://example.org/bench/{index}/{rng.getrandbits(32)}'
+        return await client.post('/dashboard/create-link', data={'original_url': url}, headers=auth(index))
+
+    async def dashboard(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        return await client.get('/dashboard', headers=auth(index))
+
+    async def login(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        email = emails[index % len(emails)]
+        return await client.post('/users/login', data={'email': email, 'password': PASSWORD})
+
+    return {
+        'redirect': redirect,
+        'create-link': create_link,
+        'dashboard': dashboard,
+        'login': login,
+    }
+
+
+def format_results(results: dict) -> str:
+    header = f"{'scenario':<12} {'req/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}"
+    lines = [header, '-' * len(header)]
+    for name, summary in results['scenarios'].items():
+        lines.append(
+            f"{name:<12} {summary['throughput']:>10.1f} {summary['p50_ms']:>9.2f} "
+            f"{summary['p95_ms']:>9.2f} {summary['p99_ms']:>9.2f} {summary['errors']:>7}"
+        )
+    return '\n'.join(lines)
+
+
+def compare(baseline: dict, candidate: dict) -> str:
+    def change(old: float, new: float) -> str:
+        return f'{(new - old) / old * 100:+.1f}%' if old else 'n/a'
+
+    header = f"{'scenario':<12} {'req/s':>10} {'p50':>9} {'p95':>9} {'p99':>9}"
+    lines = [
+        f"baseline:  {baseline['revision']['commit'][:12]}",
+        f"candidate: {candidate['revision']['commit'][:12]}",
+        header,
+        '-' * len(header),
+    ]
+    for name, new in candidate['scenarios'].items():
+        old = baseline['scenarios'].get(name)
+        if old is None:
+            continue
+        lines.append(
+            f"{name:<12} {change(old['throughput'], new['throughput']):>10} "
+            f"{change(old['p50_ms'], new['p50_ms']):>9} {change(old['p95_ms'], new['p95_ms']):>9} "
+            f"{change(old['p99_ms'], new['p99_ms']):>9}"
+        )
+    return '\n'.join(lines)
+
+
+async def run(args) -> dict:
+    from app.main import app
+
+    rng = random.Random(args.seed)
+    data = await seed(args.users, args.links)
+    requests = build_requests(data, args.skew, rng)
+
+    results = {
+        'revision': git_revision(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {
+            'database': args.database_url.split('://', 1)[0],
+            'users': args.users,
+            'links_per_user': args.links,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'skew': args.skew,
+            'bcrypt_rounds': args.bcrypt_rounds,
+            'seed': args.seed,
+        },
+        'scenarios': {},
+    }
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+            for name in args.scenarios:
+                results['scenarios'][name] = await drive(
+                    client, requests[name], args.requests, args.concurrency, EXPECTED_STATUS[name]
+                )
+
+    output = args.output or RESULTS_DIR / f"{results['revision']['commit'][:12] or 'unknown'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+
+    print(format_results(results))
+    print(f'Results saved to {output}')
+    return results
@@ -0,0 +1,81 @@
+import os
+
+import httpx
+import pytest
+
+TEST_DATABASE_URL = os.environ.get('TEST_DATABASE_URL')
+
+os.environ['DATABASE_URL'] = TEST_DATABASE_URL or 'sqlite+aiosqlite:///:memory:'
+defaults = {
+    'DATABASE_USER': 'test',
+    'DATABASE_PASSWORD': 'test',
+    'DATABASE_HOST': 'localhost',
+    'DATABASE_PORT': '5432',
+    'DATABASE_NAME': 'test',
+    'SECRET_KEY': 'test-secret-key-for-the-pytest-suite',
+    'ALGORITHM': 'HS256',
+    'DEBUG': 'false',
+    'BCRYPT_ROUNDS': '4',
+    'ROLLUP_INTERVAL': '3600',
+    'LINK_SWEEP_INTERVAL': '3600',
+}
+for key, value in defaults.items():
+    os.environ.setdefault(key, value)
+
+
+def postgres_configured() -> bool:
+    return bool(TEST_DATABASE_URL) and TEST_DATABASE_URL.startswith('postgresql')
+
+
+@pytest.fixture(scope='session')
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.fixture(scope='session')
+async def app(anyio_backend):
+    from app.core.database import Base, engine
+    from app.main import app
+
+    if not postgres_configured():
+        yield app
+        return
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with app.router.lifespan_context(app):
+        yield app
+    await engine.dispose()
+
+
+@pytest.fixture
+async def database(app):
+    if not postgres_configured():
+        pytest.skip('TEST_DATABASE_URL must point at a throwaway PostgreSQL database')
+
+    from app.core.database import Base, engine
+    from app.repositories.linkRepository import link_cache
+    from app.repositories.userRepository import user_cache
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    link_cache.clear()
+    user_cache.clear()
+    return engine
+
+
+@pytest.fixture
+async def client(app, database):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+        yield client
+
+
+async def register(client: httpx.AsyncClient, email: str, password: str = 'Password123') -> dict:
+    await client.post('/users/register', data={'email': email, 'password': password, 'password_confirm': password})
+    response = await client.post('/users/login', data={'email': email, 'password': password})
+    assert response.status_code == 303
+    token = response.cookies.get('access_token')
+    client.cookies.clear()
+    return {'authorization': f'Bearer {token}'}
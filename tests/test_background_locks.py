@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, insert, select
+
+from app.core.database import advisory_lock, async_session_maker
+from app.models import Link, User
+from app.services.clickPartitions import ClickPartitionManager
+from app.services.linkSweeper import LinkSweeper
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_sweeper_runs_in_one_worker_at_a_time(database):
+    async with async_session_maker() as session:
+        user_id = await session.scalar(
+            insert(User).values(email='sweeper@example.com', password_hash='x').returning(User.id)
+        )
+        await session.execute(insert(Link).values(
+            original_url='https://example.com', short_code='expired', user_id=user_id,
+            expires_at=datetime.now(timezone.utc) - timedelta(minutes=1),
+        ))
+        await session.commit()
+
+    sweeper = LinkSweeper(interval=60, batch_size=100, click_batch_size=100, max_batches=10)
+    async with advisory_lock('link_sweeper') as acquired:
+        assert acquired
+        assert await sweeper.run_once() == 0
+        assert sweeper.skipped_runs == 1
+
+    assert await sweeper.run_once() == 1
+    async with async_session_maker() as session:
+        assert await session.scalar(select(func.count()).select_from(Link)) == 0
+
+
+async def test_partition_maintenance_runs_in_one_worker_at_a_time(database):
+    manager = ClickPartitionManager(interval='month', premake=1, check_interval=60, retention=None)
+    async with advisory_lock('click_partitions'):
+        await manager.run_once()
+    assert (manager.skipped_runs, manager.runs) == (1, 0)
+
+    await manager.run_once()
+    assert manager.skipped_runs == 1
+    assert manager.partitioned is False
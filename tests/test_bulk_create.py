@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from app.core.config import settings
+from conftest import register
+
+pytestmark = pytest.mark.anyio
+
+
+async def login(client, email: str) -> None:
+    headers = await register(client, email)
+    client.cookies.set('access_token', headers['authorization'].removeprefix('Bearer '))
+
+
+async def test_bulk_create_streams_results(client):
+    await login(client, 'bulk@urlshortener-test.com')
+    body = 'original_url\nexample.com/a\nnot a url at all\nexample.com/b\n'
+    response = await client.post('/dashboard/bulk-create-links', content=body,
+                                 headers={'content-type': 'text/csv'})
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert results[-1] == {'created': 2, 'failed': 1}
+    assert results[1] == {'line': 3, 'error': 'Invalid URL format'}
+
+
+async def test_bulk_create_rejects_declared_oversized_body(client, monkeypatch):
+    monkeypatch.setattr(settings, 'BULK_CREATE_MAX_BODY_SIZE', 1024)
+    await login(client, 'declared@urlshortener-test.com')
+    response = await client.post('/dashboard/bulk-create-links', content='example.com/x\n' * 100,
+                                 headers={'content-type': 'text/csv'})
+    assert response.status_code == 413
+
+
+async def test_bulk_create_rejects_oversized_chunked_body(client, monkeypatch):
+    monkeypatch.setattr(settings, 'BULK_CREATE_MAX_BODY_SIZE', 1024)
+    await login(client, 'chunked@urlshortener-test.com')
+
+    async def body():
+        for _ in range(100):
+            yield b'example.com/x\n'
+
+    response = await client.post('/dashboard/bulk-create-links', content=body(),
+                                 headers={'content-type': 'text/csv'})
+    assert response.status_code == 413
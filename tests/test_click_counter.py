@@ -0,0 +1,35 @@
+import pytest
+from sqlalchemy import func, insert, select
+
+from app.core.database import async_session_maker
+from app.models import Link, User
+from app.services.clickCounter import ClickCounter
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_flush_of_many_distinct_links(database):
+    links = 20_000
+    async with async_session_maker() as session:
+        user_id = await session.scalar(
+            insert(User).values(email='counter@example.com', password_hash='x').returning(User.id)
+        )
+        result = await session.execute(
+            insert(Link).returning(Link.id, sort_by_parameter_order=True),
+            [
+                {'original_url': f'https://example.com/{index}', 'short_code': f'c{index}', 'user_id': user_id}
+                for index in range(links)
+            ],
+        )
+        link_ids = list(result.scalars().all())
+        await session.commit()
+
+    counter = ClickCounter(flush_interval=60, flush_threshold=links * 2)
+    for link_id in link_ids:
+        counter.increment(link_id, 2)
+    await counter.flush()
+
+    assert counter.stats()['pending_links'] == 0
+    assert counter.failed_flushes == 0
+    async with async_session_maker() as session:
+        assert await session.scalar(select(func.sum(Link.clicks_count))) == links * 2
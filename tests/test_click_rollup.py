@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, insert, select
+
+from app.core.database import async_session_maker
+from app.models import Click, Link, User, VisitorRollup
+from app.services.clickRollup import ClickRollupJob
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_rollup_batch_spanning_many_links(database):
+    links = 9000
+    clicked_at = datetime.now().replace(microsecond=0) - timedelta(hours=1)
+    async with async_session_maker() as session:
+        user_id = await session.scalar(
+            insert(User).values(email='rollup@example.com', password_hash='x').returning(User.id)
+        )
+        result = await session.execute(
+            insert(Link).returning(Link.id, sort_by_parameter_order=True),
+            [
+                {'original_url': f'https://example.com/{index}', 'short_code': f'r{index}', 'user_id': user_id}
+                for index in range(links)
+            ],
+        )
+        link_ids = list(result.scalars().all())
+        await session.execute(insert(Click), [
+            {
+                'ip_address': f'10.0.{index // 256}.{index % 256}',
+                'country_code': 'US',
+                'device_type': 'desktop',
+                'link_id': link_id,
+                'created_at': clicked_at,
+                'updated_at': clicked_at,
+            }
+            for index, link_id in enumerate(link_ids)
+        ])
+        await session.commit()
+
+    job = ClickRollupJob(interval=0, batch_size=50_000, lag=0, minute_retention=timedelta(hours=48), precision=11)
+    await job.run_once()
+    assert await job.run_once() == links
+
+    async with async_session_maker() as session:
+        assert await session.scalar(select(func.count()).select_from(VisitorRollup)) == links * 2
+        assert await session.scalar(select(func.sum(Link.unique_visitors))) == links
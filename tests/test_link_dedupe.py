@@ -0,0 +1,25 @@
+import pytest
+
+from app.core.config import settings
+from conftest import register
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_global_dedupe_hides_other_owners_link(client, monkeypatch):
+    monkeypatch.setattr(settings, 'LINK_DEDUPE_MODE', 'global')
+    owner = await register(client, 'owner@urlshortener-test.com')
+    other = await register(client, 'other@urlshortener-test.com')
+
+    response = await client.post('/api/links', json={'original_url': 'example.com/shared'}, headers=owner)
+    owned = response.json()
+    assert owned['id'] and 'clicks_count' in owned
+
+    response = await client.post('/api/links', json={'original_url': 'example.com/shared'}, headers=other)
+    assert response.json() == {'original_url': owned['original_url'], 'short_code': owned['short_code']}
+
+    response = await client.post('/api/links', json={'original_url': 'example.com/shared'}, headers=owner)
+    assert response.json()['id'] == owned['id']
+
+    response = await client.get('/api/links', headers=other)
+    assert response.json()['links'] == []
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from conftest import register
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_naive_expiry_is_rejected(client):
+    headers = await register(client, 'naive@urlshortener-test.com')
+    expires_at = (datetime.now() + timedelta(hours=2)).isoformat()
+    response = await client.post('/api/links', json={'original_url': 'example.com', 'expires_at': expires_at},
+                                 headers=headers)
+    assert response.status_code == 400
+
+
+async def test_dashboard_expiry_uses_the_browser_offset(client):
+    headers = await register(client, 'offset@urlshortener-test.com')
+    expected = datetime.now(timezone.utc).replace(second=0, microsecond=0) + timedelta(hours=2)
+    local = expected.astimezone(timezone(timedelta(hours=3))).replace(tzinfo=None)
+
+    client.cookies.set('access_token', headers['authorization'].removeprefix('Bearer '))
+    response = await client.post('/dashboard/create-link', data={
+        'original_url': 'example.com/offset',
+        'expires_at': local.strftime('%Y-%m-%dT%H:%M'),
+        'utc_offset': '180',
+    })
+    client.cookies.clear()
+    assert response.status_code == 303
+
+    link, = (await client.get('/api/links', headers=headers)).json()['links']
+    assert datetime.fromisoformat(link['expires_at']) == expected
+
+
+async def test_exhausted_link_returns_gone(client):
+    headers = await register(client, 'gone@urlshortener-test.com')
+    response = await client.post('/api/links', json={'original_url': 'example.com/once', 'max_clicks': 1},
+                                 headers=headers)
+    short_code = response.json()['short_code']
+
+    assert (await client.get(f'/r/{short_code}')).status_code == 302
+    response = await client.get(f'/r/{short_code}')
+    assert response.status_code == 410
+    assert 'Link expired' in response.text
+
+
+async def test_unknown_short_code_returns_not_found(client):
+    response = await client.get('/r/missing')
+    assert response.status_code == 404
+    assert 'Link not found' in response.text
@@ -0,0 +1,21 @@
+import pytest
+
+from app.repositories.userRepository import user_cache
+from conftest import register
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_logout_revokes_the_token(client):
+    headers = await register(client, 'logout@urlshortener-test.com')
+    token = headers['authorization'].removeprefix('Bearer ')
+
+    assert (await client.get('/api/links', headers=headers)).status_code == 200
+    assert token not in user_cache._data
+
+    client.cookies.set('access_token', token)
+    await client.get('/users/logout')
+    client.cookies.clear()
+
+    assert (await client.get('/api/links', headers=headers)).status_code == 401
+    assert (await client.get('/api/links', headers=headers)).status_code == 401
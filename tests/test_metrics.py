@@ -0,0 +1,15 @@
+import os
+
+from app.core.metrics import MetricsRegistry
+
+
+def test_every_series_carries_the_worker_label():
+    registry = MetricsRegistry('test')
+    registry.increment('requests', route='/r')
+    registry.histogram('latency', route='/r').observe(0.2)
+    registry.register('pool', lambda: {'size': 5, 'wait': {'count': 1, 'sum': 0.1, 'buckets': {'1.0': 1}}})
+
+    samples = [line for line in registry.render().splitlines() if not line.startswith('#')]
+    assert samples
+    assert all(f'worker="{os.getpid()}"' in line for line in samples)
+    assert f'test_worker_info{{worker="{os.getpid()}"}} 1.0' in samples
@@ -0,0 +1,42 @@
+import pytest
+from fastapi import HTTPException
+
+from app.repositories.linkRepository import LinkRepository
+from conftest import register
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('example.com', 'https://example.com'),
+    ('  http://example.com/path?q=1  ', 'http://example.com/path?q=1'),
+    ('пример.рф/путь', 'https://пример.рф/путь'),
+    ('http://[::1]:8080/', 'http://[::1]:8080/'),
+    ('192.0.2.1', 'https://192.0.2.1'),
+])
+def test_normalize_url_accepts(url, expected):
+    assert LinkRepository.normalize_url(url) == expected
+
+
+@pytest.mark.parametrize('url', [
+    'not a url at all',
+    'https://exa mple.com',
+    'https://',
+    'https://:443',
+    'example.com:99999',
+    'example.com:http',
+    'example.com:0',
+    'https://-example.com',
+    'https://example..com',
+    f'https://{"a" * 64}.com',
+])
+def test_normalize_url_rejects(url):
+    with pytest.raises(HTTPException) as error:
+        LinkRepository.normalize_url(url)
+    assert error.value.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_create_link_rejects_invalid_url(client):
+    headers = await register(client, 'urls@urlshortener-test.com')
+    response = await client.post('/api/links', json={'original_url': 'not a url at all'}, headers=headers)
+    assert response.status_code == 422
+    assert (await client.get('/api/links', headers=headers)).json()['links'] == []
@@ -0,0 +1,33 @@
+import asyncio
+import random
+
+import pytest
+
+from app.services.shortCodeAllocator import ALPHABET, FeistelPermutation, SequenceShortCodeAllocator
+
+
+@pytest.mark.parametrize('domain', [1, 2, 1000, len(ALPHABET) ** 2, len(ALPHABET) ** 3])
+def test_permutation_is_a_bijection(domain):
+    permutation = FeistelPermutation(b'bijection', domain)
+    assert sorted(permutation.permute(value) for value in range(domain)) == list(range(domain))
+
+
+def test_consecutive_ids_encode_to_distinct_codes():
+    allocator = SequenceShortCodeAllocator(b'uniqueness', length=7, block_size=1)
+    codes = {allocator.encode(value) for value in range(1, 200_001)}
+    assert len(codes) == 200_000
+    assert all(len(code) == 7 for code in codes)
+
+
+@pytest.mark.anyio
+async def test_leased_codes_are_unique_across_blocks_and_workers(database):
+    workers = [SequenceShortCodeAllocator(b'uniqueness', length=7, block_size=50) for _ in range(3)]
+    rng = random.Random(4)
+    requests = [(worker, rng.randint(1, 120)) for worker in workers for _ in range(20)]
+
+    batches = await asyncio.gather(*(worker.allocate(count) for worker, count in requests))
+
+    codes = [code for batch in batches for code in batch]
+    assert [len(batch) for batch in batches] == [count for _, count in requests]
+    assert len(set(codes)) == len(codes)
+    assert all(worker.leases > 1 for worker in workers)